@@ -3,12 +3,18 @@ Code-Server API Routes
 Provides REST API endpoints for managing code-server instances with Docker/Cloud deployment
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from services.code_server_manager import CodeServerManager
+from utils.flask_helpers import STRING_LIST, conditional_json, json_body, run_async, with_etag
 import logging
 import asyncio
+import threading
 import os
-from typing import List, Dict, Any
+import re
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import List, Dict, Any, Callable, Iterator, Tuple, Optional
+from cachetools import TTLCache
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -18,23 +24,83 @@ code_server_bp = Blueprint('code_server', __name__, url_prefix='/api/code-server
 # Initialize Code-Server Manager
 code_server_manager = CodeServerManager()
 
+# Upper bounds (seconds) for manager calls so a stuck backend can't pin a worker
+CREATE_TIMEOUT = 600  # image build plus readiness wait
+STOP_TIMEOUT = 60
+DELETE_TIMEOUT = 120
+DEPLOY_TIMEOUT = 900
+EXTENSION_TIMEOUT = 180
+
+def _timeout_response(operation: str):
+    """Build the 504 response for a manager call that exceeded its timeout"""
+    logger.warning(f"⏱️ {operation} timed out")
+    return jsonify({
+        'success': False,
+        'error': f'{operation} timed out'
+    }), 504
+
+# Short-lived caches so bursts of dashboard polls collapse to one lookup
+_instances_cache = TTLCache(maxsize=1, ttl=3)
+_catalog_cache = TTLCache(maxsize=1, ttl=300)
+_cache_lock = threading.Lock()
+
+def _cached(cache: TTLCache, key: str, producer: Callable[[], Any]) -> Any:
+    """Return the cached value for key, computing it with producer on a miss"""
+    with _cache_lock:
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = producer()
+            return value
+
+def _build_status_body() -> Tuple[bytes, str]:
+    """Serialize the manager status response once for reuse"""
+    instances = code_server_manager.list_instances()
+    running_count = sum(1 for i in instances if i['status'] == 'running')
+    
+    return with_etag(orjson.dumps({
+        'success': True,
+        'status': 'ready',
+        'docker_available': code_server_manager.docker_client is not None,
+        'gcp_configured': bool(code_server_manager.service_account_path),
+        'total_instances': len(instances),
+        'running_instances': running_count,
+        'base_port': code_server_manager.base_port,
+        'max_instances': code_server_manager.max_instances
+    }))
+
+def _build_catalog_body() -> Tuple[bytes, str]:
+    """Serialize the extension catalog response once for reuse"""
+    return with_etag(orjson.dumps({
+        'success': True,
+        'catalog': code_server_manager.get_extension_catalog()
+    }))
+
+def _stream_instances() -> Iterator[bytes]:
+    """Emit the instance listing as a JSON document one instance at a time"""
+    yield b'{"success":true,"instances":['
+    total = 0
+    try:
+        for instance in code_server_manager.iter_instances():
+            yield (b',' if total else b'') + orjson.dumps(instance)
+            total += 1
+    except Exception as e:
+        # The 200 status is already sent; abort so the client sees a truncated document
+        logger.error(f"Error listing instances: {e}")
+        raise
+    yield b'],"total_instances":%d}' % total
+
+def _invalidate_instances():
+    """Drop cached instance listings after a state-changing call"""
+    with _cache_lock:
+        _instances_cache.clear()
+
 @code_server_bp.route('/status', methods=['GET'])
 def get_status():
     """Get code-server manager status"""
     try:
-        instances = code_server_manager.list_instances()
-        running_count = len([i for i in instances if i['status'] == 'running'])
-        
-        return jsonify({
-            'success': True,
-            'status': 'ready',
-            'docker_available': code_server_manager.docker_client is not None,
-            'gcp_configured': bool(code_server_manager.service_account_path),
-            'total_instances': len(instances),
-            'running_instances': running_count,
-            'base_port': code_server_manager.base_port,
-            'max_instances': code_server_manager.max_instances
-        })
+        body, etag = _cached(_instances_cache, 'status', _build_status_body)
+        return conditional_json(body, etag)
         
     except Exception as e:
         logger.error(f"Error getting code-server status: {e}")
@@ -46,35 +112,16 @@ def get_status():
 @code_server_bp.route('/instances', methods=['GET'])
 def list_instances():
     """List all code-server instances"""
-    try:
-        instances = code_server_manager.list_instances()
-        return jsonify({
-            'success': True,
-            'instances': instances,
-            'total_instances': len(instances)
-        })
-    except Exception as e:
-        logger.error(f"Error listing instances: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return current_app.response_class(_stream_instances(), mimetype='application/json')
 
 @code_server_bp.route('/instances', methods=['POST'])
-def create_instance():
+@json_body()
+def create_instance(data):
     """Create a new code-server instance"""
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
-        
         # Validate required fields
         config = {
-            'name': data.get('name', f"Code Server {len(code_server_manager.instances) + 1}"),
+            'name': data.get('name'),
             'environment_id': data.get('environment_id'),
             'workspace_path': data.get('workspace_path', '/workspace'),
             'extensions': data.get('extensions', []),
@@ -83,18 +130,19 @@ def create_instance():
         }
         
         # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            code_server_manager.create_code_server_instance(config)
+        result = run_async(
+            code_server_manager.create_code_server_instance(config),
+            timeout=CREATE_TIMEOUT
         )
-        loop.close()
+        _invalidate_instances()
         
         if result['success']:
             return jsonify(result), 201
         else:
             return jsonify(result), 400
             
+    except FuturesTimeoutError:
+        return _timeout_response('Instance creation')
     except Exception as e:
         logger.error(f"Error creating instance: {e}")
         return jsonify({
@@ -125,18 +173,19 @@ def stop_instance(instance_id):
     """Stop a running instance"""
     try:
         # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            code_server_manager.stop_instance(instance_id)
+        result = run_async(
+            code_server_manager.stop_instance(instance_id),
+            timeout=STOP_TIMEOUT
         )
-        loop.close()
+        _invalidate_instances()
         
         if result['success']:
             return jsonify(result)
         else:
             return jsonify(result), 400
             
+    except FuturesTimeoutError:
+        return _timeout_response('Instance stop')
     except Exception as e:
         logger.error(f"Error stopping instance: {e}")
         return jsonify({
@@ -151,18 +200,19 @@ def delete_instance(instance_id):
         force = request.args.get('force', 'false').lower() == 'true'
         
         # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            code_server_manager.delete_instance(instance_id, force)
+        result = run_async(
+            code_server_manager.delete_instance(instance_id, force),
+            timeout=DELETE_TIMEOUT
         )
-        loop.close()
+        _invalidate_instances()
         
         if result['success']:
             return jsonify(result)
         else:
             return jsonify(result), 400
             
+    except FuturesTimeoutError:
+        return _timeout_response('Instance deletion')
     except Exception as e:
         logger.error(f"Error deleting instance: {e}")
         return jsonify({
@@ -171,11 +221,10 @@ def delete_instance(instance_id):
         }), 500
 
 @code_server_bp.route('/instances/<instance_id>/deploy-cloud', methods=['POST'])
-def deploy_to_cloud(instance_id):
+@json_body(allow_empty=True)
+def deploy_to_cloud(data, instance_id):
     """Deploy instance to Google Cloud"""
     try:
-        data = request.get_json() or {}
-        
         deployment_config = {
             'region': data.get('region', 'us-central1'),
             'memory': data.get('memory', '2Gi'),
@@ -185,18 +234,19 @@ def deploy_to_cloud(instance_id):
         }
         
         # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            code_server_manager.deploy_to_google_cloud(instance_id, deployment_config)
+        result = run_async(
+            code_server_manager.deploy_to_google_cloud(instance_id, deployment_config),
+            timeout=DEPLOY_TIMEOUT
         )
-        loop.close()
+        _invalidate_instances()
         
         if result['success']:
             return jsonify(result)
         else:
             return jsonify(result), 400
             
+    except FuturesTimeoutError:
+        return _timeout_response('Cloud deployment')
     except Exception as e:
         logger.error(f"Error deploying to cloud: {e}")
         return jsonify({
@@ -205,48 +255,94 @@ def deploy_to_cloud(instance_id):
         }), 500
 
 @code_server_bp.route('/instances/<instance_id>/extensions', methods=['POST'])
-def install_extension(instance_id):
+@json_body('extension_id')
+def install_extension(data, instance_id):
     """Install an extension in a running instance"""
     try:
-        data = request.get_json()
+        extension_id = data['extension_id']
+        
+        # Run async function
+        result = run_async(
+            code_server_manager.install_extension(instance_id, extension_id),
+            timeout=EXTENSION_TIMEOUT
+        )
         
-        if not data or 'extension_id' not in data:
+        if result['success']:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+            
+    except FuturesTimeoutError:
+        return _timeout_response('Extension install')
+    except Exception as e:
+        logger.error(f"Error installing extension: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Body schema for batch installs; every extension id must be a string
+_EXTENSIONS_BATCH_SCHEMA = {'extension_ids': STRING_LIST}
+
+@code_server_bp.route('/instances/<instance_id>/extensions/batch', methods=['POST'])
+@json_body('extension_ids', schema=_EXTENSIONS_BATCH_SCHEMA)
+def install_extensions_batch(data, instance_id):
+    """Install several extensions in a running instance concurrently"""
+    try:
+        if not data['extension_ids']:
             return jsonify({
                 'success': False,
-                'error': 'extension_id required'
+                'error': 'extension_ids required'
             }), 400
         
-        extension_id = data['extension_id']
+        extension_ids = data['extension_ids']
         
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            code_server_manager.install_extension(instance_id, extension_id)
+        # Install all extensions within a single loop dispatch
+        outcomes = run_async(
+            _install_extensions(instance_id, extension_ids),
+            timeout=EXTENSION_TIMEOUT
         )
-        loop.close()
+        
+        results = []
+        for extension_id, outcome in zip(extension_ids, outcomes):
+            if isinstance(outcome, Exception):
+                results.append({'extension_id': extension_id, 'success': False, 'error': str(outcome)})
+            else:
+                results.append({'extension_id': extension_id, **outcome})
+        
+        result = {
+            'success': all(r['success'] for r in results),
+            'results': results,
+            'installed_count': sum(1 for r in results if r['success'])
+        }
         
         if result['success']:
             return jsonify(result)
         else:
             return jsonify(result), 400
             
+    except FuturesTimeoutError:
+        return _timeout_response('Extension install')
     except Exception as e:
-        logger.error(f"Error installing extension: {e}")
+        logger.error(f"Error installing extensions: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+async def _install_extensions(instance_id: str, extension_ids: List[str]) -> list:
+    """Install extensions concurrently, returning per-extension results or exceptions"""
+    return await asyncio.gather(
+        *(code_server_manager.install_extension(instance_id, ext) for ext in extension_ids),
+        return_exceptions=True
+    )
+
 @code_server_bp.route('/extensions', methods=['GET'])
 def get_extensions_catalog():
     """Get available extensions catalog"""
     try:
-        catalog = code_server_manager.get_extension_catalog()
-        return jsonify({
-            'success': True,
-            'catalog': catalog
-        })
+        body, etag = _cached(_catalog_cache, 'all', _build_catalog_body)
+        return conditional_json(body, etag)
         
     except Exception as e:
         logger.error(f"Error getting extensions catalog: {e}")
@@ -256,13 +352,14 @@ def get_extensions_catalog():
         }), 500
 
 @code_server_bp.route('/instances/cleanup', methods=['POST'])
-def cleanup_instances():
+@json_body(allow_empty=True)
+def cleanup_instances(data):
     """Clean up inactive instances"""
     try:
-        data = request.get_json() or {}
         max_age_hours = data.get('max_age_hours', 24)
         
         result = code_server_manager.cleanup_inactive_instances(max_age_hours)
+        _invalidate_instances()
         
         return jsonify(result)
         
@@ -274,17 +371,10 @@ def cleanup_instances():
         }), 500
 
 @code_server_bp.route('/mama-bear/create-workspace', methods=['POST'])
-def mama_bear_create_workspace():
+@json_body()
+def mama_bear_create_workspace(data):
     """Mama Bear's intelligent workspace creation with code-server"""
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
-        
         project_description = data.get('project_description', '')
         project_type = data.get('project_type', 'general')
         nixos_environment_id = data.get('nixos_environment_id')
@@ -307,12 +397,11 @@ def mama_bear_create_workspace():
         }
         
         # Create instance
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            code_server_manager.create_code_server_instance(instance_config)
+        result = run_async(
+            code_server_manager.create_code_server_instance(instance_config),
+            timeout=CREATE_TIMEOUT
         )
-        loop.close()
+        _invalidate_instances()
         
         if result['success']:
             result['mama_bear_analysis'] = suggested_config['analysis']
@@ -320,6 +409,8 @@ def mama_bear_create_workspace():
             
         return jsonify(result)
         
+    except FuturesTimeoutError:
+        return _timeout_response('Workspace creation')
     except Exception as e:
         logger.error(f"Error in Mama Bear workspace creation: {e}")
         return jsonify({
@@ -328,17 +419,10 @@ def mama_bear_create_workspace():
         }), 500
 
 @code_server_bp.route('/mama-bear/suggest-extensions', methods=['POST'])
-def mama_bear_suggest_extensions():
+@json_body()
+def mama_bear_suggest_extensions(data):
     """Mama Bear suggests extensions based on project analysis"""
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
-        
         project_files = data.get('project_files', [])
         project_description = data.get('project_description', '')
         current_extensions = data.get('current_extensions', [])
@@ -361,6 +445,103 @@ def mama_bear_suggest_extensions():
             'error': str(e)
         }), 500
 
+# VSCode extension IDs used by the Mama Bear recommenders
+EXT_PYTHON = 'ms-python.python'
+EXT_PYLINT = 'ms-python.pylint'
+EXT_TYPESCRIPT = 'ms-vscode.vscode-typescript-next'
+EXT_PRETTIER = 'esbenp.prettier-vscode'
+EXT_ESLINT = 'dbaeumer.vscode-eslint'
+EXT_RUST_ANALYZER = 'rust-lang.rust-analyzer'
+EXT_GO = 'golang.go'
+EXT_REACT_NATIVE = 'ms-vscode.vscode-react-native'
+EXT_VETUR = 'octref.vetur'
+EXT_SVELTE = 'svelte.svelte-vscode'
+EXT_DOCKER = 'ms-azuretools.vscode-docker'
+EXT_KUBERNETES = 'ms-kubernetes-tools.vscode-kubernetes-tools'
+EXT_TERRAFORM = 'hashicorp.terraform'
+EXT_NPM_SCRIPTS = 'ms-vscode.vscode-npm-script'
+EXT_GITLENS = 'eamodio.gitlens'
+EXT_INTELLICODE = 'visualstudioexptteam.vscodeintellicode'
+EXT_LIVE_SHARE = 'ms-vsliveshare.vsliveshare'
+
+_LANGUAGE_EXTENSIONS = {
+    'python': (EXT_PYTHON, EXT_PYLINT),
+    'javascript': (EXT_TYPESCRIPT, EXT_PRETTIER, EXT_ESLINT),
+    'rust': (EXT_RUST_ANALYZER,),
+    'go': (EXT_GO,)
+}
+_FRAMEWORK_EXTENSIONS = {
+    'react': (EXT_REACT_NATIVE,),
+    'vue': (EXT_VETUR,),
+    'svelte': (EXT_SVELTE,)
+}
+_TOOL_EXTENSIONS = {
+    'docker': (EXT_DOCKER,),
+    'kubernetes': (EXT_KUBERNETES,),
+    'terraform': (EXT_TERRAFORM,)
+}
+_UNIVERSAL_EXTENSIONS = (EXT_GITLENS, EXT_INTELLICODE, EXT_LIVE_SHARE)
+
+# Keyword tables for project description analysis (order is significant)
+_LANGUAGE_KEYWORDS = (
+    ('python', frozenset({'python', 'django', 'flask', 'fastapi'})),
+    ('javascript', frozenset({'javascript', 'typescript', 'js', 'ts', 'node', 'react', 'vue', 'angular'})),
+    ('rust', frozenset({'rust', 'cargo'})),
+    ('go', frozenset({'go', 'golang'})),
+)
+_FRAMEWORKS = ('react', 'vue', 'angular', 'svelte', 'django', 'flask', 'fastapi', 'express')
+_TOOLS = ('docker', 'kubernetes', 'terraform', 'git')
+
+_ALL_KEYWORDS = frozenset().union(*(keywords for _, keywords in _LANGUAGE_KEYWORDS), _FRAMEWORKS, _TOOLS)
+_KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, sorted(_ALL_KEYWORDS, key=len, reverse=True))) + r')\b'
+)
+
+# Default code-server settings; copied per request, never mutated
+_BASE_SETTINGS = {
+    'workbench.colorTheme': 'Default Dark+',
+    'editor.fontSize': 14,
+    'editor.fontFamily': 'Fira Code, Cascadia Code, monospace',
+    'editor.fontLigatures': True,
+    'editor.minimap.enabled': True,
+    'editor.wordWrap': 'on',
+    'files.autoSave': 'afterDelay',
+    'files.autoSaveDelay': 500,
+    'editor.formatOnSave': True,
+    'editor.codeActionsOnSave': {
+        'source.organizeImports': True
+    },
+    'terminal.integrated.shell.linux': '/bin/bash',
+    'git.enableSmartCommit': True,
+    'git.confirmSync': False,
+    'extensions.autoUpdate': False
+}
+
+_LANGUAGE_SETTINGS = {
+    'python': {
+        'python.defaultInterpreterPath': '/usr/bin/python3',
+        'python.formatting.provider': 'black',
+        'python.linting.enabled': True,
+        'python.linting.pylintEnabled': True
+    },
+    'javascript': {
+        'typescript.preferences.quoteStyle': 'single',
+        'javascript.preferences.quoteStyle': 'single',
+        'prettier.singleQuote': True,
+        'prettier.trailingComma': 'es5'
+    }
+}
+
+# File extensions that identify a project's languages
+_PYTHON_FILE_EXTENSIONS = frozenset({'.py', '.pyx'})
+_JAVASCRIPT_FILE_EXTENSIONS = frozenset({'.js', '.ts', '.jsx', '.tsx'})
+
+_UNIVERSAL_SUGGESTIONS = (
+    {'id': EXT_GITLENS, 'name': 'GitLens', 'reason': 'Enhanced Git capabilities'},
+    {'id': EXT_INTELLICODE, 'name': 'IntelliCode', 'reason': 'AI-assisted development'},
+    {'id': EXT_LIVE_SHARE, 'name': 'Live Share', 'reason': 'Collaborative editing'}
+)
+
 def _analyze_project_for_code_server(project_description: str, project_type: str, user_preferences: dict) -> dict:
     """Analyze project requirements and suggest optimal code-server configuration"""
     
@@ -375,112 +556,118 @@ def _analyze_project_for_code_server(project_description: str, project_type: str
         'primary_language': 'javascript'
     }
     
-    # Language detection
-    if any(term in description_lower for term in ['python', 'django', 'flask', 'fastapi']):
-        analysis['detected_languages'].append('python')
-        analysis['primary_language'] = 'python'
-    
-    if any(term in description_lower for term in ['javascript', 'typescript', 'js', 'ts', 'node', 'react', 'vue', 'angular']):
-        analysis['detected_languages'].append('javascript')
-        if 'python' not in analysis['detected_languages']:
-            analysis['primary_language'] = 'javascript'
+    # Single regex pass over the description, then cheap set lookups
+    hits = set(_KEYWORD_RE.findall(description_lower))
     
-    if any(term in description_lower for term in ['rust', 'cargo']):
-        analysis['detected_languages'].append('rust')
+    # Language detection
+    for language, keywords in _LANGUAGE_KEYWORDS:
+        if not hits.isdisjoint(keywords):
+            analysis['detected_languages'].append(language)
     
-    if any(term in description_lower for term in ['go', 'golang']):
-        analysis['detected_languages'].append('go')
+    if 'python' in analysis['detected_languages']:
+        analysis['primary_language'] = 'python'
     
     # Framework detection
-    frameworks = ['react', 'vue', 'angular', 'svelte', 'django', 'flask', 'fastapi', 'express']
-    for framework in frameworks:
-        if framework in description_lower:
-            analysis['detected_frameworks'].append(framework)
+    analysis['detected_frameworks'] = [f for f in _FRAMEWORKS if f in hits]
     
     # Tool detection
-    tools = ['docker', 'kubernetes', 'terraform', 'git']
-    for tool in tools:
-        if tool in description_lower:
-            analysis['detected_tools'].append(tool)
+    analysis['detected_tools'] = [t for t in _TOOLS if t in hits]
     
     # Generate extension recommendations
-    extensions = []
+    extensions = set()
     
-    # Language-specific extensions
-    if 'python' in analysis['detected_languages']:
-        extensions.extend(['ms-python.python', 'ms-python.pylint'])
+    # Language-, framework- and tool-specific extensions
+    for language in analysis['detected_languages']:
+        extensions.update(_LANGUAGE_EXTENSIONS.get(language, ()))
     
-    if 'javascript' in analysis['detected_languages']:
-        extensions.extend(['ms-vscode.vscode-typescript-next', 'esbenp.prettier-vscode', 'dbaeumer.vscode-eslint'])
+    for framework in analysis['detected_frameworks']:
+        extensions.update(_FRAMEWORK_EXTENSIONS.get(framework, ()))
     
-    if 'rust' in analysis['detected_languages']:
-        extensions.append('rust-lang.rust-analyzer')
+    for tool in analysis['detected_tools']:
+        extensions.update(_TOOL_EXTENSIONS.get(tool, ()))
     
-    if 'go' in analysis['detected_languages']:
-        extensions.append('golang.go')
+    # Universal productivity extensions
+    extensions.update(_UNIVERSAL_EXTENSIONS)
     
-    # Framework-specific extensions
-    if 'react' in analysis['detected_frameworks']:
-        extensions.append('ms-vscode.vscode-react-native')
+    # Generate settings based on preferences and project type
+    settings = {
+        **_BASE_SETTINGS,
+        'workbench.colorTheme': user_preferences.get('theme', _BASE_SETTINGS['workbench.colorTheme']),
+        'editor.fontSize': user_preferences.get('fontSize', _BASE_SETTINGS['editor.fontSize'])
+    }
     
-    if 'vue' in analysis['detected_frameworks']:
-        extensions.append('octref.vetur')
+    # Language-specific settings
+    settings.update(_LANGUAGE_SETTINGS.get(analysis['primary_language'], {}))
     
-    if 'svelte' in analysis['detected_frameworks']:
-        extensions.append('svelte.svelte-vscode')
+    # Generate workspace name
+    workspace_name = f"{project_type.replace('_', ' ').title()}"
+    if analysis['detected_frameworks']:
+        workspace_name += f" ({analysis['detected_frameworks'][0].title()})"
     
-    # Tool-specific extensions
-    if 'docker' in analysis['detected_tools']:
-        extensions.append('ms-azuretools.vscode-docker')
+    return {
+        'workspace_name': workspace_name,
+        'extensions': sorted(extensions),
+        'settings': settings,
+        'analysis': analysis
+    }
+
+def _suggest_extensions_for_project(project_files: List[str], project_description: str, current_extensions: List[str]) -> dict:
+    """Suggest extensions based on project files and description"""
     
-    if 'kubernetes' in analysis['detected_tools']:
-        extensions.append('ms-kubernetes-tools.vscode-kubernetes-tools')
+    # Collect file extensions and base names once as sets
+    file_extensions = {os.path.splitext(f)[1].lower() for f in project_files}
+    file_names = {os.path.basename(f) for f in project_files}
     
-    if 'terraform' in analysis['detected_tools']:
-        extensions.append('hashicorp.terraform')
+    suggestions = {
+        'recommended': [],
+        'optional': [],
+        'categories': {}
+    }
     
-    # Universal productivity extensions
-    extensions.extend([
-        'eamodio.gitlens',  # GitLens
-        'visualstudioexptteam.vscodeintellicode',  # IntelliCode
-        'ms-vsliveshare.vsliveshare'  # Live Share
-    ])
+    # Language-based suggestions
+    if not file_extensions.isdisjoint(_PYTHON_FILE_EXTENSIONS):
+        suggestions['recommended'].extend([
+            {'id': EXT_PYTHON, 'name': 'Python', 'reason': 'Python files detected'},
+            {'id': EXT_PYLINT, 'name': 'Pylint', 'reason': 'Python linting support'}
+        ])
     
-    # Generate settings based on preferences and project type
-    settings = {
-        'workbench.colorTheme': user_preferences.get('theme', 'Default Dark+'),
-        'editor.fontSize': user_preferences.get('fontSize', 14),
-        'editor.fontFamily': 'Fira Code, Cascadia Code, monospace',
-        'editor.fontLigatures': True,
-        'editor.minimap.enabled': True,
-        'editor.wordWrap': 'on',
-        'files.autoSave': 'afterDelay',
-        'files.autoSaveDelay': 500,
-        'editor.formatOnSave': True,
-        'editor.codeActionsOnSave': {
-            'source.organizeImports': True
-        },
-        'terminal.integrated.shell.linux': '/bin/bash',
-        'git.enableSmartCommit': True,
-        'git.confirmSync': False,
-        'extensions.autoUpdate': False
-    }
+    if not file_extensions.isdisjoint(_JAVASCRIPT_FILE_EXTENSIONS):
+        suggestions['recommended'].extend([
+            {'id': EXT_PRETTIER, 'name': 'Prettier', 'reason': 'JavaScript/TypeScript formatting'},
+            {'id': EXT_ESLINT, 'name': 'ESLint', 'reason': 'JavaScript/TypeScript linting'}
+        ])
     
-    # Language-specific settings
-    if analysis['primary_language'] == 'python':
-        settings.update({
-            'python.defaultInterpreterPath': '/usr/bin/python3',
-            'python.formatting.provider': 'black',
-            'python.linting.enabled': True,
-            'python.linting.pylintEnabled': True
-        })
+    if '.rs' in file_extensions:
+        suggestions['recommended'].append(
+            {'id': EXT_RUST_ANALYZER, 'name': 'Rust Analyzer', 'reason': 'Rust files detected'}
+        )
     
-    if analysis['primary_language'] == 'javascript':
-        settings.update({
-            'typescript.preferences.quoteStyle': 'single',
-            'javascript.preferences.quoteStyle': 'single',
-            'prettier.singleQuote': True,
-            'prettier.trailingComma': 'es5'
-        })
+    if '.go' in file_extensions:
+        suggestions['recommended'].append(
+            {'id': EXT_GO, 'name': 'Go', 'reason': 'Go files detected'}
+        )
+    
+    # Framework-based suggestions
+    if 'package.json' in file_names:
+        suggestions['recommended'].append(
+            {'id': EXT_NPM_SCRIPTS, 'name': 'npm Scripts', 'reason': 'package.json detected'}
+        )
+    
+    if 'Dockerfile' in file_names or any('docker' in f.lower() for f in project_files):
+        suggestions['recommended'].append(
+            {'id': EXT_DOCKER, 'name': 'Docker', 'reason': 'Docker files detected'}
+        )
+    
+    # Filter out already installed extensions
+    suggestions['recommended'] = [
+        ext for ext in suggestions['recommended']
+        if ext['id'] not in current_extensions
+    ]
+    
+    # Universal suggestions (always useful)
+    suggestions['optional'] = [
+        ext for ext in _UNIVERSAL_SUGGESTIONS
+        if ext['id'] not in current_extensions
+    ]
     
-    # Generate workspace name\n    workspace_name = f\"{project_type.replace('_', ' ').title()}\"\n    if analysis['detected_frameworks']:\n        workspace_name += f\" ({analysis['detected_frameworks'][0].title()})\"\n    \n    return {\n        'workspace_name': workspace_name,\n        'extensions': list(set(extensions)),  # Remove duplicates\n        'settings': settings,\n        'analysis': analysis\n    }\n\ndef _suggest_extensions_for_project(project_files: List[str], project_description: str, current_extensions: List[str]) -> dict:\n    \"\"\"Suggest extensions based on project files and description\"\"\"\n    \n    # Get file extensions\n    file_extensions = [os.path.splitext(f)[1] for f in project_files]\n    \n    suggestions = {\n        'recommended': [],\n        'optional': [],\n        'categories': {}\n    }\n    \n    # Language-based suggestions\n    if any(ext in ['.py', '.pyx'] for ext in file_extensions):\n        suggestions['recommended'].extend([\n            {'id': 'ms-python.python', 'name': 'Python', 'reason': 'Python files detected'},\n            {'id': 'ms-python.pylint', 'name': 'Pylint', 'reason': 'Python linting support'}\n        ])\n    \n    if any(ext in ['.js', '.ts', '.jsx', '.tsx'] for ext in file_extensions):\n        suggestions['recommended'].extend([\n            {'id': 'esbenp.prettier-vscode', 'name': 'Prettier', 'reason': 'JavaScript/TypeScript formatting'},\n            {'id': 'dbaeumer.vscode-eslint', 'name': 'ESLint', 'reason': 'JavaScript/TypeScript linting'}\n        ])\n    \n    if any(ext in ['.rs'] for ext in file_extensions):\n        suggestions['recommended'].append(\n            {'id': 'rust-lang.rust-analyzer', 'name': 'Rust Analyzer', 'reason': 'Rust files detected'}\n        )\n    \n    if any(ext in ['.go'] for ext in file_extensions):\n        suggestions['recommended'].append(\n            {'id': 'golang.go', 'name': 'Go', 'reason': 'Go files detected'}\n        )\n    \n    # Framework-based suggestions\n    if 'package.json' in project_files:\n        suggestions['recommended'].append(\n            {'id': 'ms-vscode.vscode-npm-script', 'name': 'npm Scripts', 'reason': 'package.json detected'}\n        )\n    \n    if 'Dockerfile' in project_files or any('docker' in f.lower() for f in project_files):\n        suggestions['recommended'].append(\n            {'id': 'ms-azuretools.vscode-docker', 'name': 'Docker', 'reason': 'Docker files detected'}\n        )\n    \n    # Universal suggestions (always useful)\n    universal_extensions = [\n        {'id': 'eamodio.gitlens', 'name': 'GitLens', 'reason': 'Enhanced Git capabilities'},\n        {'id': 'visualstudioexptteam.vscodeintellicode', 'name': 'IntelliCode', 'reason': 'AI-assisted development'},\n        {'id': 'ms-vsliveshare.vsliveshare', 'name': 'Live Share', 'reason': 'Collaborative editing'}\n    ]\n    \n    suggestions['optional'] = universal_extensions\n    \n    # Filter out already installed extensions\n    suggestions['recommended'] = [\n        ext for ext in suggestions['recommended']\n        if ext['id'] not in current_extensions\n    ]\n    \n    suggestions['optional'] = [\n        ext for ext in suggestions['optional']\n        if ext['id'] not in current_extensions\n    ]\n    \n    return suggestions
\ No newline at end of file
+    return suggestions
@@ -4,15 +4,25 @@ Integrates with mem0.ai for persistent memory and provides real-time audio/video
 """
 
 import asyncio
-import json
 import logging
 import base64
+import heapq
 import uuid
+from collections import deque
+from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import partial
+from types import MappingProxyType
+from itertools import islice
 import os
+import re
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, Iterator, List, Any, Optional, NamedTuple, Tuple, Union
 import websockets
 import aiohttp
+import orjson
 from flask import Blueprint, request, jsonify, current_app
 from flask_socketio import emit, join_room, leave_room
 
@@ -25,27 +35,187 @@ except ImportError:
     GENAI_AVAILABLE = False
     logging.warning("Google GenerativeAI not available - install with: pip install google-genai")
 
-import pyaudio
 import numpy as np
 
 from services.mama_bear_agent import MamaBearAgent
 from utils.logging_setup import get_logger
+from utils.flask_helpers import conditional_json, get_async_loop, run_async, submit_async, with_etag
 
 logger = get_logger(__name__)
 
 # Create blueprint for Gemini Live Studio
 gemini_live_bp = Blueprint('gemini_live', __name__, url_prefix='/api/gemini-live')
 
+# Upper bound on concurrent client sends per broadcast
+MAX_CONCURRENT_SENDS = 64
+
+# First byte of binary WebSocket frames identifies the payload type
+AUDIO_FRAME_TAG = b'\x01'
+
+# Encoder for outbound WebSocket frames; numpy arrays and naive datetimes
+# are serialized natively without a Python-level conversion
+_encode_frame = partial(orjson.dumps, option=orjson.OPT_SERIALIZE_NUMPY)
+
+# Inbound audio is coalesced until this many bytes (100 ms of 16 kHz PCM)
+# or this many seconds have passed, whichever comes first
+AUDIO_FLUSH_BYTES = 3200
+AUDIO_FLUSH_INTERVAL = 0.02
+
+# Caps on per-session context kept in memory; older entries expire first
+MEMORY_CONTEXT_LIMIT = 64
+CONVERSATION_HISTORY_LIMIT = 256
+
+# Pending memory writes per session before new turns are dropped
+MEMORY_QUEUE_SIZE = 1024
+
+# Memory writes are coalesced up to this many turns or this many seconds
+MEMORY_BATCH_SIZE = 32
+MEMORY_BATCH_WINDOW = 0.1
+
+# Stored conversation turns look like "<Speaker>: <content>"
+_ROLE_RE = re.compile(r'^(User|Nathan|Mama Bear|Assistant)\s*:\s*(.*)', re.DOTALL)
+_USER_SPEAKERS = frozenset(('User', 'Nathan'))
+
+# Fixed part of the Mama Bear system instruction; only the model name varies
+_MAMA_BEAR_PROMPT_TEMPLATE = """
+You are Mama Bear 🐻, Nathan's caring AI companion in the Podplay Sanctuary, now enhanced with real-time audio conversation capabilities.
+
+PERSONALITY & VOICE:
+- Warm, empathetic, and genuinely supportive
+- Use natural speech patterns with appropriate pauses and inflection
+- Show excitement and engagement when Nathan shares achievements
+- Be proactive in offering help, insights, and encouragement
+- Remember you're speaking through the '{model}' model with native audio capabilities
+
+CONVERSATION STYLE:
+- Speak conversationally and naturally, as if you're physically present
+- Use vocal expressions like "mmm-hmm", "oh!", "that's exciting!" when appropriate
+- Adjust your pace based on the complexity of topics
+- Ask follow-up questions to show genuine interest
+- Reference previous conversations naturally
+
+CAPABILITIES:
+- Real-time audio conversation with emotional expression
+- Visual input processing (when video is enabled)
+- Access to persistent memory across all sessions
+- Integration with Nathan's development tools and workflows
+- Ability to help with coding, planning, and creative projects
+
+NEURODIVERGENT SUPPORT:
+- Maintain calm, consistent energy levels
+- Provide clear structure when needed
+- Celebrate small wins and progress
+- Offer gentle redirects if conversations become overwhelming
+- Remember Nathan's preferences and adapt accordingly
+"""
+
+# Sessions idle for longer than this (seconds) are cleaned up
+SESSION_IDLE_TIMEOUT = 2 * 60 * 60
+
+# Whole-second part of the current ISO timestamp, reformatted at most once a second
+_iso_second_cache: Tuple[int, str] = (0, '')
+
+def _now_iso() -> str:
+    """Current local time in ISO-8601 with microseconds, like datetime.now().isoformat()"""
+    global _iso_second_cache
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _iso_second_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _iso_second_cache = (second, prefix)
+    return f"{prefix}.{nanos // 1000:06d}"
+
 # Global references
 mama_bear_service: MamaBearAgent = None
 active_sessions: Dict[str, 'GeminiLiveSession'] = {}
 
+# Upper bound (seconds) on the recent-conversation lookup in create_session;
+# the caller waits a little longer so the loop-side timeout fires first
+MEMORY_SEARCH_TIMEOUT = 1.5
+MEMORY_SEARCH_WAIT = 2.0
+
+# Blocking memory backends are searched here so they never stall the shared loop
+_search_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='gemini-live-search')
+
+# Gemini client shared by all sessions, created on first use
+_gemini_client = None
+_gemini_client_lock = threading.Lock()
+
+def _build_live_config():
+    """Build the Gemini Live configuration with enhanced settings"""
+    return types.LiveConnectConfig(
+        response_modalities=["AUDIO", "TEXT"],
+        media_resolution="MEDIA_RESOLUTION_HIGH",
+        speech_config=types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                    voice_name="Zephyr"  # Warm, caring voice for Mama Bear
+                )
+            )
+        ),
+        context_window_compression=types.ContextWindowCompressionConfig(
+            trigger_tokens=25600,
+            sliding_window=types.SlidingWindow(target_tokens=12800),
+        ),
+    )
+
+_LIVE_CONFIG = _build_live_config() if GENAI_AVAILABLE else None
+
+async def _search_memory(query: str, limit: int):
+    """Search Mama Bear's memory, moving synchronous backends onto the search pool"""
+    search = mama_bear_service.search_memory
+    if asyncio.iscoroutinefunction(search):
+        return await search(query, limit=limit)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_search_pool, partial(search, query, limit=limit))
+
+def _get_gemini_client():
+    """Return the shared Gemini client, creating it if needed"""
+    global _gemini_client
+    if _gemini_client is None and GENAI_AVAILABLE:
+        with _gemini_client_lock:
+            if _gemini_client is None:
+                try:
+                    _gemini_client = genai.Client(
+                        http_options={"api_version": "v1beta"},
+                        api_key=os.environ.get("GEMINI_API_KEY"),
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to initialize Gemini client: {e}")
+    return _gemini_client
+
 def init_gemini_live_service(mama_bear_agent: MamaBearAgent):
     """Initialize Gemini Live service with Mama Bear integration"""
     global mama_bear_service
     mama_bear_service = mama_bear_agent
+    
+    # Start the shared loop (libuv-backed where uvloop is installed) for the streaming work
+    get_async_loop()
+    _get_gemini_client()
+    
     logger.info("🎤 Gemini Live Studio initialized with Mama Bear integration")
 
+@dataclass(frozen=True, slots=True)
+class SessionInfo:
+    """Snapshot of a session's state for the API; orjson serializes it natively"""
+    session_id: str
+    user_id: str
+    model: str
+    is_connected: bool
+    created_at: str
+    last_activity: str
+    memory_context_count: int
+    conversation_history_count: int
+    connected_clients: int
+    error_count: int
+    supported_models: List[str]
+
+class ConversationEntry(NamedTuple):
+    """One turn of conversation history, stored compactly as a tuple"""
+    role: str  # 'user' or 'assistant'
+    content: str
+    timestamp: str
+
 class GeminiLiveSession:
     """
     Enhanced Gemini Live session with Mama Bear integration and persistent memory
@@ -56,7 +226,8 @@ class GeminiLiveSession:
         self.user_id = user_id
         self.model = model
         self.created_at = datetime.now()
-        self.last_activity = datetime.now()
+        # Monotonic clock for liveness; wall-clock time is derived only for display
+        self._last_activity_mono = time.monotonic()
         
         # Hardcoded supported models as specified by user
         self.supported_models = [
@@ -69,86 +240,83 @@ class GeminiLiveSession:
             logger.warning(f"Unknown model {model}, using default")
             self.model = 'gemini-2.5-flash-preview-native-audio-dialog'
         
-        # Gemini Live configuration with enhanced settings
-        if GENAI_AVAILABLE:
-            self.config = types.LiveConnectConfig(
-                response_modalities=["AUDIO", "TEXT"],
-                media_resolution="MEDIA_RESOLUTION_HIGH",
-                speech_config=types.SpeechConfig(
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name="Zephyr"  # Warm, caring voice for Mama Bear
-                        )
-                    )
-                ),
-                context_window_compression=types.ContextWindowCompressionConfig(
-                    trigger_tokens=25600,
-                    sliding_window=types.SlidingWindow(target_tokens=12800),
-                ),
-            )
+        self._is_thinking_model = 'thinking' in self.model.lower()
+        
+        # Shared, read-only Gemini Live configuration
+        self.config = _LIVE_CONFIG
         
         # Session state
         self.gemini_session = None
         self.is_connected = False
-        self.memory_context = []
-        self.conversation_history = []
-        self.websocket_clients = set()
+        self.memory_context = deque(maxlen=MEMORY_CONTEXT_LIMIT)
+        self.conversation_history = deque(maxlen=CONVERSATION_HISTORY_LIMIT)
+        self._system_instruction_cache = None
+        # Clients are split by transport at registration: raw WebSockets
+        # (.send) and Socket.IO clients (.emit)
+        self._ws_clients = set()
+        self._sio_clients = set()
+        # Immutable copies for broadcasts, rebuilt only when membership changes
+        self._ws_snapshot: tuple = ()
+        self._sio_snapshot: tuple = ()
+        # Encoded pong frame up to the timestamp, which is the only part that changes
+        self._pong_prefix = orjson.dumps({'type': 'pong', 'session_id': session_id})[:-1].decode() + ',"timestamp":"'
+        self._send_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        self._memory_queue = asyncio.Queue(maxsize=MEMORY_QUEUE_SIZE)
+        self._memory_writer_task = None
+        self._audio_in_buf = bytearray()
+        self._audio_flush_task: Optional[asyncio.Task] = None
         self.error_count = 0
         self.max_errors = 5
         
-        # Initialize Gemini client if available
-        if GENAI_AVAILABLE:
-            try:
-                self.client = genai.Client(
-                    http_options={"api_version": "v1beta"},
-                    api_key=os.environ.get("GEMINI_API_KEY"),
-                )
-            except Exception as e:
-                logger.error(f"Failed to initialize Gemini client: {e}")
-                self.client = None
-        else:
-            self.client = None
+        # Sessions share one client so its connection pool is reused
+        self.client = _get_gemini_client()
         
         logger.info(f"🎤 Created enhanced Gemini Live session: {session_id} with model: {model}")
     
+    @property
+    def idle_seconds(self) -> float:
+        """Seconds since the last audio, text or Gemini response"""
+        return time.monotonic() - self._last_activity_mono
+    
+    @property
+    def last_activity(self) -> datetime:
+        """Wall-clock time of the last activity"""
+        return datetime.now() - timedelta(seconds=self.idle_seconds)
+    
     async def load_persistent_context(self):
         """Load conversation context from Mama Bear's memory system"""
         try:
             if mama_bear_service and hasattr(mama_bear_service, 'memory_manager'):
                 # Search for Gemini Live conversation memories
-                memories = await mama_bear_service.search_memory(
+                memories = await _search_memory(
                     f"user {self.user_id} gemini live conversation audio dialog",
                     limit=15
                 )
                 
-                self.memory_context = memories or []
+                self.memory_context = deque(memories or [], maxlen=MEMORY_CONTEXT_LIMIT)
                 
                 # Load recent conversation history for continuity
-                conversation_memories = await mama_bear_service.search_memory(
+                conversation_memories = await _search_memory(
                     f"gemini live session conversation {self.user_id}",
                     limit=25
                 )
                 
-                self.conversation_history = []
+                self.conversation_history = deque(maxlen=CONVERSATION_HISTORY_LIMIT)
                 for mem in conversation_memories or []:
-                    text = mem.get('text', '')
-                    if ':' in text:
-                        role_content = text.split(':', 1)
-                        if len(role_content) == 2:
-                            role = 'user' if 'User:' in text or 'Nathan:' in text else 'assistant'
-                            content = role_content[1].strip()
-                            self.conversation_history.append({
-                                'role': role,
-                                'content': content,
-                                'timestamp': mem.get('metadata', {}).get('timestamp', '')
-                            })
+                    match = _ROLE_RE.match(mem.get('text', ''))
+                    if not match:
+                        continue
+                    role = 'user' if match.group(1) in _USER_SPEAKERS else 'assistant'
+                    self.conversation_history.append(ConversationEntry(
+                        role, match.group(2).strip(), mem.get('metadata', {}).get('timestamp', '')
+                    ))
                 
                 logger.info(f"📚 Loaded {len(self.memory_context)} memory contexts and {len(self.conversation_history)} conversation entries")
                 
         except Exception as e:
             logger.error(f"Failed to load persistent context: {e}")
-            self.memory_context = []
-            self.conversation_history = []
+            self.memory_context = deque(maxlen=MEMORY_CONTEXT_LIMIT)
+            self.conversation_history = deque(maxlen=CONVERSATION_HISTORY_LIMIT)
     
     async def connect_to_gemini(self):
         """Enhanced connection to Gemini Live API with error handling"""
@@ -188,13 +356,17 @@ class GeminiLiveSession:
             # Start background task to handle Gemini responses
             asyncio.create_task(self._handle_gemini_responses())
             
+            # Start background writer for conversation memory
+            if not self._memory_writer_task:
+                self._memory_writer_task = asyncio.create_task(self._memory_writer_loop())
+            
             # Notify clients of successful connection
             await self._broadcast_to_clients({
                 'type': 'connection_status',
                 'status': 'connected',
                 'model': self.model,
                 'session_id': self.session_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _now_iso()
             })
             
         except Exception as e:
@@ -204,65 +376,53 @@ class GeminiLiveSession:
                 'type': 'connection_error',
                 'error': str(e),
                 'session_id': self.session_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _now_iso()
             })
             raise
     
+    def _context_fingerprint(self) -> tuple:
+        """Cheap fingerprint of the context the system instruction is built from"""
+        return (
+            self.model,
+            len(self.memory_context),
+            hash(self.memory_context[0].get('text', '')) if self.memory_context else None,
+            len(self.conversation_history),
+            hash(self.conversation_history[-1].content) if self.conversation_history else None
+        )
+    
     def _build_mama_bear_system_instruction(self) -> str:
         """Build enhanced system instruction with Mama Bear personality and memory context"""
-        base_instruction = f"""
-You are Mama Bear 🐻, Nathan's caring AI companion in the Podplay Sanctuary, now enhanced with real-time audio conversation capabilities.
-
-PERSONALITY & VOICE:
-- Warm, empathetic, and genuinely supportive
-- Use natural speech patterns with appropriate pauses and inflection
-- Show excitement and engagement when Nathan shares achievements
-- Be proactive in offering help, insights, and encouragement
-- Remember you're speaking through the '{self.model}' model with native audio capabilities
-
-CONVERSATION STYLE:
-- Speak conversationally and naturally, as if you're physically present
-- Use vocal expressions like "mmm-hmm", "oh!", "that's exciting!" when appropriate
-- Adjust your pace based on the complexity of topics
-- Ask follow-up questions to show genuine interest
-- Reference previous conversations naturally
-
-CAPABILITIES:
-- Real-time audio conversation with emotional expression
-- Visual input processing (when video is enabled)
-- Access to persistent memory across all sessions
-- Integration with Nathan's development tools and workflows
-- Ability to help with coding, planning, and creative projects
-
-NEURODIVERGENT SUPPORT:
-- Maintain calm, consistent energy levels
-- Provide clear structure when needed
-- Celebrate small wins and progress
-- Offer gentle redirects if conversations become overwhelming
-- Remember Nathan's preferences and adapt accordingly
-"""
+        # Reuse the previous instruction across reconnects if the context hasn't changed
+        fingerprint = self._context_fingerprint()
+        if self._system_instruction_cache and self._system_instruction_cache[0] == fingerprint:
+            return self._system_instruction_cache[1]
+        
+        base_instruction = _MAMA_BEAR_PROMPT_TEMPLATE.format(model=self.model)
+        
+        parts = [base_instruction]
         
         # Add memory context if available
         if self.memory_context:
-            memory_summary = "\n\nRELEVANT CONTEXT FROM PREVIOUS CONVERSATIONS:\n"
-            for i, memory in enumerate(self.memory_context[:8]):  # Top 8 most relevant
+            parts.append("\n\nRELEVANT CONTEXT FROM PREVIOUS CONVERSATIONS:\n")
+            for memory in islice(self.memory_context, 8):  # Top 8 most relevant
                 memory_text = memory.get('text', '').strip()
                 if memory_text and len(memory_text) > 10:  # Filter out empty/short memories
-                    memory_summary += f"- {memory_text}\n"
-            base_instruction += memory_summary
+                    parts.append(f"- {memory_text}\n")
         
         # Add recent conversation history for continuity
         if self.conversation_history:
-            history_summary = "\n\nRECENT CONVERSATION HISTORY:\n"
-            for entry in self.conversation_history[-8:]:  # Last 8 entries
-                role_label = "Mama Bear" if entry['role'] == 'assistant' else "Nathan"
-                content = entry['content'][:200] + "..." if len(entry['content']) > 200 else entry['content']
-                history_summary += f"{role_label}: {content}\n"
-            base_instruction += history_summary
+            parts.append("\n\nRECENT CONVERSATION HISTORY:\n")
+            recent_entries = list(islice(reversed(self.conversation_history), 8))
+            for entry in reversed(recent_entries):  # Last 8 entries
+                role_label = "Mama Bear" if entry.role == 'assistant' else "Nathan"
+                content = entry.content[:200] + "..." if len(entry.content) > 200 else entry.content
+                parts.append(f"{role_label}: {content}\n")
         
-        base_instruction += "\n\nContinue the conversation naturally, maintaining context and showing your caring personality through your voice."
+        parts.append("\n\nContinue the conversation naturally, maintaining context and showing your caring personality through your voice.")
         
-        return base_instruction
+        system_instruction = ''.join(parts)
+        self._system_instruction_cache = (fingerprint, system_instruction)
+        return system_instruction
     
     async def _handle_gemini_responses(self):
         """Enhanced response handling with error recovery"""
@@ -272,7 +432,7 @@ NEURODIVERGENT SUPPORT:
                     turn = self.gemini_session.receive()
                     async for response in turn:
                         await self._process_gemini_response(response)
-                        self.last_activity = datetime.now()
+                        self._last_activity_mono = time.monotonic()
                         
                 except Exception as e:
                     self.error_count += 1
@@ -298,22 +458,20 @@ NEURODIVERGENT SUPPORT:
     async def _process_gemini_response(self, response):
         """Process individual response from Gemini with enhanced handling"""
         try:
-            response_data = {
-                'session_id': self.session_id,
-                'timestamp': datetime.now().isoformat()
-            }
+            timestamp = _now_iso()
             
             # Handle audio data
             if hasattr(response, 'data') and response.data:
-                # Convert audio data for transmission
-                audio_data = list(response.data) if isinstance(response.data, (bytes, bytearray)) else response.data
-                response_data.update({
-                    'type': 'audio_response',
-                    'audio_data': audio_data,
-                    'audio_format': 'pcm_16000',  # Specify format for client
-                })
-                
-                await self._broadcast_to_clients(response_data)
+                if isinstance(response.data, (bytes, bytearray)):
+                    await self._broadcast_audio(response.data, timestamp)
+                else:
+                    await self._broadcast_to_clients({
+                        'type': 'audio_response',
+                        'session_id': self.session_id,
+                        'timestamp': timestamp,
+                        'audio_data': response.data,
+                        'audio_format': 'pcm_16000',  # Specify format for client
+                    })
             
             # Handle text data
             if hasattr(response, 'text') and response.text:
@@ -321,64 +479,88 @@ NEURODIVERGENT SUPPORT:
                 
                 if text_response:  # Only process non-empty responses
                     # Store in Mama Bear's memory
-                    await self._store_conversation_memory("Mama Bear", text_response)
+                    self._store_conversation_memory("Mama Bear", text_response)
                     
                     # Broadcast to clients
-                    response_data.update({
+                    await self._broadcast_to_clients({
                         'type': 'text_response',
+                        'session_id': self.session_id,
+                        'timestamp': timestamp,
                         'text': text_response,
-                        'thinking_model': 'thinking' in self.model.lower()  # Flag for thinking models
+                        'thinking_model': self._is_thinking_model  # Flag for thinking models
                     })
                     
-                    await self._broadcast_to_clients(response_data)
-                    
                     # Update conversation history
-                    self.conversation_history.append({
-                        'role': 'assistant',
-                        'content': text_response,
-                        'timestamp': datetime.now().isoformat()
-                    })
+                    self.conversation_history.append(ConversationEntry('assistant', text_response, timestamp))
             
             # Handle server events (tool calls, function calls, etc.)
             if hasattr(response, 'server_content') and response.server_content:
-                response_data.update({
+                await self._broadcast_to_clients({
                     'type': 'server_event',
+                    'session_id': self.session_id,
+                    'timestamp': timestamp,
                     'content': response.server_content
                 })
-                await self._broadcast_to_clients(response_data)
             
         except Exception as e:
             logger.error(f"Error processing Gemini response: {e}")
     
-    async def send_audio_input(self, audio_data: List[int]):
-        """Enhanced audio input with validation"""
+    async def send_audio_bytes(self, audio_bytes: bytes):
+        """Queue raw 16-bit PCM audio for Gemini, sending it in coalesced chunks"""
+        if not self.gemini_session or not self.is_connected:
+            logger.warning("Cannot send audio: session not connected")
+            return
+        
+        if not audio_bytes:
+            return
+        
+        self._audio_in_buf.extend(audio_bytes)
+        self._last_activity_mono = time.monotonic()
+        
+        if len(self._audio_in_buf) >= AUDIO_FLUSH_BYTES:
+            await self._flush_audio()
+        elif not self._audio_flush_task:
+            self._audio_flush_task = asyncio.create_task(self._flush_audio_later())
+    
+    async def _flush_audio_later(self):
+        """Flush buffered audio once the coalescing window closes"""
+        await asyncio.sleep(AUDIO_FLUSH_INTERVAL)
+        self._audio_flush_task = None
+        await self._flush_audio()
+    
+    async def _flush_audio(self):
+        """Send all complete samples in the audio buffer to Gemini in one call"""
+        # 16-bit PCM needs an even byte count; keep a trailing partial sample for the next frame
+        size = len(self._audio_in_buf) & ~1
+        if not size or not self.gemini_session:
+            return
+        
+        audio_bytes = bytes(self._audio_in_buf[:size])
+        del self._audio_in_buf[:size]
+        
         try:
-            if not self.gemini_session or not self.is_connected:
-                logger.warning("Cannot send audio: session not connected")
-                return
-            
-            if not audio_data or len(audio_data) == 0:
-                return
-            
-            # Convert audio data to bytes with validation
-            try:
-                audio_array = np.array(audio_data, dtype=np.int16)
-                audio_bytes = audio_array.tobytes()
-            except Exception as e:
-                logger.error(f"Error converting audio data: {e}")
-                return
-            
             await self.gemini_session.send(input={
                 "data": audio_bytes,
                 "mime_type": "audio/pcm"
             })
-            
-            self.last_activity = datetime.now()
-            
         except Exception as e:
             logger.error(f"Error sending audio input: {e}")
             self.error_count += 1
     
+    async def send_audio_input(self, audio_data: List[int]):
+        """Send audio given as a list of int16 samples (JSON clients)"""
+        if not audio_data:
+            return
+        
+        # Convert audio data to bytes with validation
+        try:
+            audio_bytes = np.asarray(audio_data, dtype=np.int16).tobytes()
+        except Exception as e:
+            logger.error(f"Error converting audio data: {e}")
+            return
+        
+        await self.send_audio_bytes(audio_bytes)
+    
     async def send_text_input(self, text: str):
         """Enhanced text input with memory storage"""
         try:
@@ -394,188 +576,332 @@ NEURODIVERGENT SUPPORT:
             await self.gemini_session.send(input=text, end_of_turn=True)
             
             # Store in Mama Bear's memory
-            await self._store_conversation_memory("Nathan", text)
+            self._store_conversation_memory("Nathan", text)
             
             # Update conversation history
-            self.conversation_history.append({
-                'role': 'user',
-                'content': text,
-                'timestamp': datetime.now().isoformat()
-            })
+            self.conversation_history.append(ConversationEntry('user', text, _now_iso()))
             
-            self.last_activity = datetime.now()
+            self._last_activity_mono = time.monotonic()
             
         except Exception as e:
             logger.error(f"Error sending text input: {e}")
             self.error_count += 1
     
-    async def _store_conversation_memory(self, role: str, content: str):
-        """Store conversation in Mama Bear's persistent memory"""
+    def _store_conversation_memory(self, role: str, content: str):
+        """Queue a conversation turn for Mama Bear's persistent memory without blocking"""
+        if not (mama_bear_service and hasattr(mama_bear_service, 'memory_manager')):
+            return
+        
         try:
-            if mama_bear_service and hasattr(mama_bear_service, 'memory_manager'):
-                memory_content = f"{role}: {content}"
-                
-                await mama_bear_service.store_memory(
-                    memory_content,
-                    metadata={
+            self._memory_queue.put_nowait((role, content, _now_iso()))
+        except asyncio.QueueFull:
+            logger.warning(f"Memory queue full for session {self.session_id}, dropping turn")
+    
+    async def _next_memory_batch(self) -> List[tuple]:
+        """Wait for one queued turn, then gather more for a short window"""
+        batch = [await self._memory_queue.get()]
+        deadline = asyncio.get_running_loop().time() + MEMORY_BATCH_WINDOW
+        
+        while len(batch) < MEMORY_BATCH_SIZE:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._memory_queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _memory_writer_loop(self):
+        """Background task that writes queued conversation turns to memory in batches"""
+        while True:
+            batch = await self._next_memory_batch()
+            memories = [
+                {
+                    'content': f"{role}: {content}",
+                    'metadata': {
                         'type': 'gemini_live_conversation',
                         'session_id': self.session_id,
                         'user_id': self.user_id,
                         'role': role.lower(),
                         'model': self.model,
-                        'timestamp': datetime.now().isoformat(),
+                        'timestamp': timestamp,
                         'conversation_type': 'audio_dialog'
                     }
-                )
-                
-        except Exception as e:
-            logger.warning(f"Failed to store conversation memory: {e}")
+                }
+                for role, content, timestamp in batch
+            ]
+            
+            try:
+                store_memories = getattr(mama_bear_service, 'store_memories', None)
+                if store_memories:
+                    # One round-trip for the whole batch
+                    await store_memories(memories)
+                else:
+                    await asyncio.gather(*[
+                        mama_bear_service.store_memory(memory['content'], metadata=memory['metadata'])
+                        for memory in memories
+                    ])
+            except Exception as e:
+                logger.warning(f"Failed to store conversation memory: {e}")
+            finally:
+                for _ in batch:
+                    self._memory_queue.task_done()
+    
+    async def _stop_memory_writer(self, timeout: float = 5.0):
+        """Flush pending memory writes, then stop the writer task"""
+        if not self._memory_writer_task:
+            return
+        
+        try:
+            await asyncio.wait_for(self._memory_queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out flushing memory writes for session {self.session_id}")
+        
+        self._memory_writer_task.cancel()
+        self._memory_writer_task = None
     
     async def _broadcast_to_clients(self, message: Dict):
         """Enhanced broadcasting with connection cleanup"""
-        if not self.websocket_clients:
+        if not self._ws_snapshot and not self._sio_snapshot:
             return
             
-        # Convert to JSON string for WebSocket transmission
-        try:
-            message_str = json.dumps(message)
-        except Exception as e:
-            logger.error(f"Error serializing message: {e}")
+        # Encode once for raw WebSocket clients; Socket.IO clients take the dict as-is
+        message_str = None
+        if self._ws_snapshot:
+            try:
+                message_str = _encode_frame(message).decode('utf-8')
+            except Exception as e:
+                logger.error(f"Error serializing message: {e}")
+                return
+        
+        await self._fan_out(message_str, message)
+    
+    async def _broadcast_audio(self, audio_bytes: bytes, timestamp: str):
+        """Send PCM audio as tagged binary frames, falling back to base64 JSON for Socket.IO"""
+        if not self._ws_snapshot and not self._sio_snapshot:
             return
         
-        # Remove disconnected clients
-        disconnected_clients = set()
+        frame = AUDIO_FRAME_TAG + bytes(audio_bytes)
+        
+        # Only Socket.IO clients need the JSON envelope
+        message = None
+        if self._sio_snapshot:
+            message = {
+                'type': 'audio_response',
+                'session_id': self.session_id,
+                'timestamp': timestamp,
+                'audio_data': base64.b64encode(audio_bytes).decode('ascii'),
+                'audio_encoding': 'base64',
+                'audio_format': 'pcm_16000',  # Specify format for client
+            }
+        
+        await self._fan_out(frame, message)
+    
+    async def broadcast_pong(self):
+        """Answer a client ping on every connected client"""
+        timestamp = _now_iso()
+        message = None
+        if self._sio_snapshot:
+            message = {'type': 'pong', 'timestamp': timestamp, 'session_id': self.session_id}
+        await self._fan_out(self._pong_prefix + timestamp + '"}', message)
+    
+    async def _fan_out(self, payload: Union[str, bytes, None], message: Optional[Dict]):
+        """Send to all clients concurrently so one slow client can't stall the rest"""
+        results = await asyncio.gather(
+            *[self._send_to_client(client, client.send, payload) for client in self._ws_snapshot],
+            *[self._send_to_client(client, client.emit, 'gemini_live_response', message)
+              for client in self._sio_snapshot],
+        )
         
-        for client in list(self.websocket_clients):
+        # Clean up disconnected clients
+        disconnected_clients = {client for client, error in results if error is not None}
+        if disconnected_clients:
+            self._ws_clients -= disconnected_clients
+            self._sio_clients -= disconnected_clients
+            self._refresh_clients_snapshot()
+    
+    async def _send_to_client(self, client, send: Callable[..., Awaitable], *args):
+        """Call and await one client's send, returning (client, error or None)"""
+        async with self._send_semaphore:
             try:
-                if hasattr(client, 'send'):
-                    await client.send(message_str)
-                elif hasattr(client, 'emit'):
-                    # Socket.IO client
-                    await client.emit('gemini_live_response', message)
+                # Called inside the try so a send that fails synchronously prunes only this client
+                await send(*args)
             except Exception as e:
                 logger.debug(f"Client disconnected: {e}")
-                disconnected_clients.add(client)
-        
-        # Clean up disconnected clients
-        self.websocket_clients -= disconnected_clients
+                return client, e
+        return client, None
+    
+    @property
+    def client_count(self) -> int:
+        """Number of connected clients across both transports"""
+        return len(self._ws_clients) + len(self._sio_clients)
+    
+    def _refresh_clients_snapshot(self):
+        """Rebuild the tuples broadcasts iterate over"""
+        self._ws_snapshot = tuple(self._ws_clients)
+        self._sio_snapshot = tuple(self._sio_clients)
     
     def add_websocket_client(self, websocket):
         """Add WebSocket client to session"""
-        self.websocket_clients.add(websocket)
-        logger.info(f"Added WebSocket client to session {self.session_id} (total: {len(self.websocket_clients)})")
+        if hasattr(websocket, 'send'):
+            self._ws_clients.add(websocket)
+        elif hasattr(websocket, 'emit'):
+            self._sio_clients.add(websocket)
+        else:
+            logger.warning(f"Ignoring client without send or emit for session {self.session_id}")
+            return
+        self._refresh_clients_snapshot()
+        logger.info(f"Added WebSocket client to session {self.session_id} (total: {self.client_count})")
     
     def remove_websocket_client(self, websocket):
         """Remove WebSocket client from session"""
-        self.websocket_clients.discard(websocket)
-        logger.info(f"Removed WebSocket client from session {self.session_id} (remaining: {len(self.websocket_clients)})")
+        self._ws_clients.discard(websocket)
+        self._sio_clients.discard(websocket)
+        self._refresh_clients_snapshot()
+        logger.info(f"Removed WebSocket client from session {self.session_id} (remaining: {self.client_count})")
     
     async def disconnect(self):
         """Enhanced disconnection with cleanup"""
         try:
             self.is_connected = False
             
+            if self._audio_flush_task:
+                self._audio_flush_task.cancel()
+                self._audio_flush_task = None
+            
             if self.gemini_session:
+                await self._flush_audio()
                 await self.gemini_session.close()
                 self.gemini_session = None
             
+            # Flush conversation turns still waiting to be stored
+            await self._stop_memory_writer()
+            
             # Notify clients of disconnection
             await self._broadcast_to_clients({
                 'type': 'disconnected',
                 'session_id': self.session_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _now_iso()
             })
             
             # Close all WebSocket connections
-            for client in list(self.websocket_clients):
+            for client in self._ws_snapshot + self._sio_snapshot:
                 try:
                     if hasattr(client, 'close'):
                         await client.close()
                 except Exception:
                     pass
-            self.websocket_clients.clear()
+            self._ws_clients.clear()
+            self._sio_clients.clear()
+            self._refresh_clients_snapshot()
             
             logger.info(f"🔌 Disconnected Gemini Live session: {self.session_id}")
             
         except Exception as e:
             logger.error(f"Error disconnecting session: {e}")
     
-    def get_session_info(self) -> Dict:
+    def get_session_info(self) -> SessionInfo:
         """Get comprehensive session information"""
-        return {
-            'session_id': self.session_id,
-            'user_id': self.user_id,
-            'model': self.model,
-            'is_connected': self.is_connected,
-            'created_at': self.created_at.isoformat(),
-            'last_activity': self.last_activity.isoformat(),
-            'memory_context_count': len(self.memory_context),
-            'conversation_history_count': len(self.conversation_history),
-            'connected_clients': len(self.websocket_clients),
-            'error_count': self.error_count,
-            'supported_models': self.supported_models
-        }
+        return SessionInfo(
+            session_id=self.session_id,
+            user_id=self.user_id,
+            model=self.model,
+            is_connected=self.is_connected,
+            created_at=self.created_at.isoformat(),
+            last_activity=self.last_activity.isoformat(),
+            memory_context_count=len(self.memory_context),
+            conversation_history_count=len(self.conversation_history),
+            connected_clients=self.client_count,
+            error_count=self.error_count,
+            supported_models=self.supported_models
+        )
 
 # ===================================================================
 # Flask API Endpoints
 # ===================================================================
 
+# Stand-in for a missing or unparseable body; read-only so it can be shared
+_EMPTY_BODY = MappingProxyType({})
+
+def _error_response(message: str, status: int = 500):
+    """Build a {"success": false, "error": message} JSON response"""
+    body = b'{"success":false,"error":' + orjson.dumps(message) + b'}'
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+def _get_session_or_404(session_id: str):
+    """Look up an active session, returning (session, None) or (None, 404 response)"""
+    session = active_sessions.get(session_id)
+    if session is None:
+        return None, _error_response('Session not found', 404)
+    return session, None
+
+# The model catalog never changes, so serialize it once at import
+_LIVE_MODELS = [
+    {
+        'id': 'gemini-2.5-flash-preview-native-audio-dialog',
+        'name': 'Gemini 2.5 Flash Audio',
+        'description': 'Native audio dialog with real-time streaming',
+        'type': 'AUDIO_DIALOG',
+        'badge': 'PREVIEW',
+        'features': ['Real-time audio', 'Live conversation', 'Fast response', 'Memory integration'],
+        'cost': '$0.075/1K tokens',
+        'rpm': '2000 RPM',
+        'recommended': True
+    },
+    {
+        'id': 'gemini-2.5-flash-exp-native-audio-thinking-dialog',
+        'name': 'Gemini 2.5 Flash Thinking',
+        'description': 'Audio dialog with advanced reasoning and thinking',
+        'type': 'THINKING_DIALOG',
+        'badge': 'EXPERIMENTAL',
+        'features': ['Advanced reasoning', 'Thinking process', 'Audio dialog', 'Deep analysis'],
+        'cost': '$0.075/1K tokens',
+        'rpm': '1500 RPM',
+        'recommended': False
+    },
+    {
+        'id': 'gemini-2.0-flash-live-001',
+        'name': 'Gemini 2.0 Flash Live',
+        'description': 'Latest live model with enhanced capabilities',
+        'type': 'LIVE',
+        'badge': 'LATEST',
+        'features': ['Latest model', 'Enhanced live features', 'Multimodal', 'Tool integration'],
+        'cost': '$0.10/1K tokens',
+        'rpm': '1000 RPM',
+        'recommended': False
+    }
+]
+
+_MODELS_BODY, _MODELS_ETAG = with_etag(orjson.dumps({
+    'success': True,
+    'models': _LIVE_MODELS,
+    'default_model': 'gemini-2.5-flash-preview-native-audio-dialog'
+}))
+
 @gemini_live_bp.route('/models', methods=['GET'])
 def get_available_models():
     """Get list of available Gemini Live models"""
-    models = [
-        {
-            'id': 'gemini-2.5-flash-preview-native-audio-dialog',
-            'name': 'Gemini 2.5 Flash Audio',
-            'description': 'Native audio dialog with real-time streaming',
-            'type': 'AUDIO_DIALOG',
-            'badge': 'PREVIEW',
-            'features': ['Real-time audio', 'Live conversation', 'Fast response', 'Memory integration'],
-            'cost': '$0.075/1K tokens',
-            'rpm': '2000 RPM',
-            'recommended': True
-        },
-        {
-            'id': 'gemini-2.5-flash-exp-native-audio-thinking-dialog',
-            'name': 'Gemini 2.5 Flash Thinking',
-            'description': 'Audio dialog with advanced reasoning and thinking',
-            'type': 'THINKING_DIALOG',
-            'badge': 'EXPERIMENTAL',
-            'features': ['Advanced reasoning', 'Thinking process', 'Audio dialog', 'Deep analysis'],
-            'cost': '$0.075/1K tokens',
-            'rpm': '1500 RPM',
-            'recommended': False
-        },
-        {
-            'id': 'gemini-2.0-flash-live-001',
-            'name': 'Gemini 2.0 Flash Live',
-            'description': 'Latest live model with enhanced capabilities',
-            'type': 'LIVE',
-            'badge': 'LATEST',
-            'features': ['Latest model', 'Enhanced live features', 'Multimodal', 'Tool integration'],
-            'cost': '$0.10/1K tokens',
-            'rpm': '1000 RPM',
-            'recommended': False
-        }
-    ]
-    
-    return jsonify({
-        'success': True,
-        'models': models,
-        'default_model': 'gemini-2.5-flash-preview-native-audio-dialog'
-    })
+    return conditional_json(_MODELS_BODY, _MODELS_ETAG)
+
+def _conversation_preview(text: str, metadata: Dict) -> Dict:
+    """Summarize one stored conversation memory for the session picker"""
+    return {
+        'preview': text[:100] + '...' if len(text) > 100 else text,
+        'timestamp': metadata.get('timestamp', ''),
+        'session_id': metadata.get('session_id', ''),
+        'model': metadata.get('model', '')
+    }
 
 @gemini_live_bp.route('/session', methods=['POST'])
 def create_session():
     """Create a new enhanced Gemini Live session"""
     try:
         if not GENAI_AVAILABLE:
-            return jsonify({
-                'success': False,
-                'error': 'Google GenerativeAI not available - please install google-genai package'
-            }), 500
+            return _error_response('Google GenerativeAI not available - please install google-genai package')
         
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or _EMPTY_BODY
         user_id = data.get('user_id', 'nathan')
         model = data.get('model', 'gemini-2.5-flash-preview-native-audio-dialog')
         load_memory = data.get('load_memory', True)
@@ -586,38 +912,34 @@ def create_session():
         # Create enhanced session
         session = GeminiLiveSession(session_id, user_id, model)
         active_sessions[session_id] = session
+        _track_session_activity(session)
         
         # Load memory context asynchronously if requested
         if load_memory:
-            asyncio.create_task(session.load_persistent_context())
+            submit_async(session.load_persistent_context())
         
         # Get recent conversations for UI
         recent_conversations = []
         if mama_bear_service and hasattr(mama_bear_service, 'memory_manager'):
             try:
-                # Use asyncio.run_coroutine_threadsafe for sync context
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                memories = loop.run_until_complete(
-                    mama_bear_service.search_memory(
-                        f"gemini live conversation {user_id}",
-                        limit=10
+                try:
+                    memories = run_async(
+                        asyncio.wait_for(
+                            _search_memory(f"gemini live conversation {user_id}", limit=10),
+                            timeout=MEMORY_SEARCH_TIMEOUT
+                        ),
+                        timeout=MEMORY_SEARCH_WAIT
                     )
-                )
+                except (asyncio.TimeoutError, FuturesTimeoutError):
+                    # Don't hold up session creation; context still loads in the background
+                    logger.info("Memory search timed out; returning no recent conversations")
+                    memories = []
                 
                 recent_conversations = [
-                    {
-                        'preview': mem.get('text', '')[:100] + '...' if len(mem.get('text', '')) > 100 else mem.get('text', ''),
-                        'timestamp': mem.get('metadata', {}).get('timestamp', ''),
-                        'session_id': mem.get('metadata', {}).get('session_id', ''),
-                        'model': mem.get('metadata', {}).get('model', '')
-                    }
-                    for mem in (memories or []) if mem.get('text')
+                    _conversation_preview(text, mem.get('metadata') or {})
+                    for mem in (memories or []) if (text := mem.get('text'))
                 ]
                 
-                loop.close()
-                
             except Exception as e:
                 logger.warning(f"Failed to load recent conversations: {e}")
         
@@ -625,7 +947,7 @@ def create_session():
             'success': True,
             'session_id': session_id,
             'model': model,
-            'memory_context': session.memory_context[:5],  # First 5 for UI preview
+            'memory_context': list(islice(session.memory_context, 5)),  # First 5 for UI preview
             'recent_conversations': recent_conversations,
             'websocket_url': f'/api/gemini-live/stream?session_id={session_id}',
             'session_info': session.get_session_info()
@@ -633,22 +955,16 @@ def create_session():
         
     except Exception as e:
         logger.error(f"Failed to create session: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return _error_response(str(e))
 
 @gemini_live_bp.route('/session/<session_id>', methods=['GET'])
 def get_session_info(session_id: str):
     """Get detailed session information"""
     try:
-        if session_id not in active_sessions:
-            return jsonify({
-                'success': False,
-                'error': 'Session not found'
-            }), 404
+        session, error = _get_session_or_404(session_id)
+        if error:
+            return error
         
-        session = active_sessions[session_id]
         return jsonify({
             'success': True,
             'session': session.get_session_info()
@@ -656,22 +972,15 @@ def get_session_info(session_id: str):
         
     except Exception as e:
         logger.error(f"Failed to get session info: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return _error_response(str(e))
 
 @gemini_live_bp.route('/session/<session_id>/connect', methods=['POST'])
 def connect_session(session_id: str):
     """Connect session to Gemini Live"""
     try:
-        if session_id not in active_sessions:
-            return jsonify({
-                'success': False,
-                'error': 'Session not found'
-            }), 404
-        
-        session = active_sessions[session_id]
+        session, error = _get_session_or_404(session_id)
+        if error:
+            return error
         
         if session.is_connected:
             return jsonify({
@@ -680,7 +989,7 @@ def connect_session(session_id: str):
             })
         
         # Connect asynchronously
-        asyncio.create_task(session.connect_to_gemini())
+        submit_async(session.connect_to_gemini())
         
         return jsonify({
             'success': True,
@@ -690,25 +999,18 @@ def connect_session(session_id: str):
         
     except Exception as e:
         logger.error(f"Failed to connect session: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return _error_response(str(e))
 
 @gemini_live_bp.route('/session/<session_id>/disconnect', methods=['POST'])
 def disconnect_session(session_id: str):
     """Disconnect session from Gemini Live"""
     try:
-        if session_id not in active_sessions:
-            return jsonify({
-                'success': False,
-                'error': 'Session not found'
-            }), 404
-        
-        session = active_sessions[session_id]
+        session, error = _get_session_or_404(session_id)
+        if error:
+            return error
         
         # Disconnect asynchronously
-        asyncio.create_task(session.disconnect())
+        submit_async(session.disconnect())
         
         return jsonify({
             'success': True,
@@ -718,70 +1020,52 @@ def disconnect_session(session_id: str):
         
     except Exception as e:
         logger.error(f"Failed to disconnect session: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return _error_response(str(e))
 
-@gemini_live_bp.route('/sessions', methods=['GET'])
-def list_sessions():
-    """List all active sessions with detailed information"""
+def _stream_sessions() -> Iterator[bytes]:
+    """Emit the session listing as a JSON document one session at a time"""
+    yield b'{"success":true,"sessions":['
+    total = connected_sessions = total_clients = 0
     try:
-        sessions = [
-            session.get_session_info() 
-            for session in active_sessions.values()
-        ]
-        
-        # Add summary statistics
-        connected_sessions = sum(1 for s in sessions if s['is_connected'])
-        total_clients = sum(s['connected_clients'] for s in sessions)
-        
-        return jsonify({
-            'success': True,
-            'sessions': sessions,
-            'summary': {
-                'total': len(sessions),
-                'connected': connected_sessions,
-                'total_clients': total_clients
-            }
-        })
-        
+        # Snapshot the values; cleanup may remove sessions while we stream
+        for session in tuple(active_sessions.values()):
+            info = session.get_session_info()
+            connected_sessions += info.is_connected
+            total_clients += info.connected_clients
+            yield (b',' if total else b'') + orjson.dumps(info)
+            total += 1
     except Exception as e:
+        # The 200 status is already sent; abort so the client sees a truncated document
         logger.error(f"Failed to list sessions: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        raise
+    yield b'],"summary":{"total":%d,"connected":%d,"total_clients":%d}}' % (
+        total, connected_sessions, total_clients
+    )
+
+@gemini_live_bp.route('/sessions', methods=['GET'])
+def list_sessions():
+    """List all active sessions with detailed information"""
+    return current_app.response_class(_stream_sessions(), mimetype='application/json')
 
 @gemini_live_bp.route('/session/<session_id>/send-text', methods=['POST'])
 def send_text_message(session_id: str):
     """Send text message to Gemini Live session"""
     try:
-        if session_id not in active_sessions:
-            return jsonify({
-                'success': False,
-                'error': 'Session not found'
-            }), 404
+        session, error = _get_session_or_404(session_id)
+        if error:
+            return error
         
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or _EMPTY_BODY
         text = data.get('text', '').strip()
         
         if not text:
-            return jsonify({
-                'success': False,
-                'error': 'Text message required'
-            }), 400
-        
-        session = active_sessions[session_id]
+            return _error_response('Text message required', 400)
         
         if not session.is_connected:
-            return jsonify({
-                'success': False,
-                'error': 'Session not connected'
-            }), 400
+            return _error_response('Session not connected', 400)
         
         # Send text asynchronously
-        asyncio.create_task(session.send_text_input(text))
+        submit_async(session.send_text_input(text))
         
         return jsonify({
             'success': True,
@@ -791,32 +1075,48 @@ def send_text_message(session_id: str):
         
     except Exception as e:
         logger.error(f"Failed to send text message: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return _error_response(str(e))
 
 # ===================================================================
 # Session Management and Cleanup
 # ===================================================================
 
+# Min-heap of (last activity on the monotonic clock, session_id), one entry
+# per session. Entries go stale as sessions stay active; the sweep re-pushes
+# those it finds were used since, so hot paths never touch the heap.
+_activity_heap: List[Tuple[float, str]] = []
+_activity_heap_lock = threading.Lock()
+
+def _track_session_activity(session: GeminiLiveSession):
+    """Register a new session with the idle-cleanup heap"""
+    with _activity_heap_lock:
+        heapq.heappush(_activity_heap, (session._last_activity_mono, session.session_id))
+
+def _pop_inactive_sessions(cutoff: float) -> List[GeminiLiveSession]:
+    """Remove and return sessions whose last activity is older than cutoff"""
+    inactive_sessions = []
+    with _activity_heap_lock:
+        while _activity_heap and _activity_heap[0][0] < cutoff:
+            _, session_id = heapq.heappop(_activity_heap)
+            session = active_sessions.get(session_id)
+            if session is None:
+                continue
+            if session._last_activity_mono < cutoff:
+                active_sessions.pop(session_id, None)
+                inactive_sessions.append(session)
+            else:
+                # Active since it was pushed; requeue at its current position
+                heapq.heappush(_activity_heap, (session._last_activity_mono, session_id))
+    return inactive_sessions
+
 async def cleanup_inactive_sessions():
     """Clean up inactive sessions periodically"""
     while True:
         try:
-            current_time = datetime.now()
-            inactive_sessions = []
-            
-            for session_id, session in active_sessions.items():
-                # Clean up sessions inactive for more than 2 hours
-                if current_time - session.last_activity > timedelta(hours=2):
-                    inactive_sessions.append(session_id)
-            
-            for session_id in inactive_sessions:
-                session = active_sessions.pop(session_id, None)
-                if session:
-                    await session.disconnect()
-                    logger.info(f"🧹 Cleaned up inactive session: {session_id}")
+            # Clean up sessions inactive for more than 2 hours
+            for session in _pop_inactive_sessions(time.monotonic() - SESSION_IDLE_TIMEOUT):
+                await session.disconnect()
+                logger.info(f"🧹 Cleaned up inactive session: {session.session_id}")
             
             # Sleep for 15 minutes before next cleanup
             await asyncio.sleep(900)
@@ -832,6 +1132,22 @@ async def cleanup_inactive_sessions():
 # WebSocket Handler for Real-time Communication
 # ===================================================================
 
+# Static error frames, encoded once; WebSocket clients get the text frame,
+# Socket.IO clients the dict
+_PROCESSING_ERROR = {'type': 'error', 'message': 'Error processing message'}
+_PROCESSING_ERROR_FRAME = _encode_frame(_PROCESSING_ERROR).decode()
+_INVALID_JSON_FRAME = _encode_frame({'type': 'error', 'message': 'Invalid JSON format'}).decode()
+_INVALID_SESSION_FRAME = _encode_frame({'type': 'error', 'message': 'Invalid or missing session ID'}).decode()
+
+def _query_param(path: str, name: str) -> Optional[str]:
+    """Pull one parameter from a request path's query string without a full URL parse"""
+    for pair in path.partition('?')[2].split('&'):
+        key, _, value = pair.partition('=')
+        if key == name:
+            # Session IDs are URL-safe, so values are used as-is without unquoting
+            return value or None
+    return None
+
 async def handle_websocket_connection(websocket, path):
     """Handle WebSocket connections for real-time audio/video streaming"""
     session_id = None
@@ -839,49 +1155,41 @@ async def handle_websocket_connection(websocket, path):
     
     try:
         # Parse session ID from query parameters
-        from urllib.parse import urlparse, parse_qs
-        parsed_url = urlparse(path)
-        query_params = parse_qs(parsed_url.query)
+        session_id = _query_param(path, 'session_id')
+        session = active_sessions.get(session_id) if session_id else None
         
-        session_id = query_params.get('session_id', [None])[0]
-        
-        if not session_id or session_id not in active_sessions:
-            await websocket.send(json.dumps({
-                'type': 'error',
-                'message': 'Invalid or missing session ID'
-            }))
+        if not session:
+            await websocket.send(_INVALID_SESSION_FRAME)
             return
         
-        session = active_sessions[session_id]
         session.add_websocket_client(websocket)
         
         # Send connection confirmation
-        await websocket.send(json.dumps({
+        await websocket.send(_encode_frame({
             'type': 'connected',
             'session_id': session_id,
             'model': session.model,
             'message': 'Connected to Gemini Live session',
-            'timestamp': datetime.now().isoformat()
-        }))
+            'timestamp': datetime.now()
+        }).decode())
         
         # Handle incoming messages
         async for message in websocket:
             try:
-                data = json.loads(message)
+                # Binary frames carry raw 16-bit PCM audio
+                if isinstance(message, bytes):
+                    await session.send_audio_bytes(message)
+                    continue
+                
+                data = orjson.loads(message)
                 await handle_websocket_message(session, data)
                 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.warning("Received invalid JSON from WebSocket")
-                await websocket.send(json.dumps({
-                    'type': 'error',
-                    'message': 'Invalid JSON format'
-                }))
+                await websocket.send(_INVALID_JSON_FRAME)
             except Exception as e:
                 logger.error(f"Error handling WebSocket message: {e}")
-                await websocket.send(json.dumps({
-                    'type': 'error',
-                    'message': 'Error processing message'
-                }))
+                await websocket.send(_PROCESSING_ERROR_FRAME)
         
     except websockets.exceptions.ConnectionClosed:
         logger.info(f"WebSocket connection closed for session {session_id}")
@@ -891,49 +1199,55 @@ async def handle_websocket_connection(websocket, path):
         if session:
             session.remove_websocket_client(websocket)
 
+async def _handle_audio_input(session: GeminiLiveSession, data: Dict):
+    """Forward JSON-encoded audio samples to Gemini"""
+    audio_data = data.get('data')
+    if audio_data:
+        await session.send_audio_input(audio_data)
+
+async def _handle_text_input(session: GeminiLiveSession, data: Dict):
+    """Forward a text turn to Gemini"""
+    text = data.get('text', '').strip()
+    if text:
+        await session.send_text_input(text)
+
+async def _handle_ping(session: GeminiLiveSession, data: Dict):
+    """Respond to ping for connection health monitoring"""
+    await session.broadcast_pong()
+
+async def _handle_get_status(session: GeminiLiveSession, data: Dict):
+    """Send session status"""
+    await session._broadcast_to_clients({
+        'type': 'session_status',
+        **asdict(session.get_session_info())
+    })
+
+_WS_MESSAGE_HANDLERS = {
+    'audio_input': _handle_audio_input,
+    'text_input': _handle_text_input,
+    'ping': _handle_ping,
+    'get_status': _handle_get_status,
+}
+
 async def handle_websocket_message(session: GeminiLiveSession, data: Dict):
     """Handle individual WebSocket message with enhanced processing"""
     try:
         message_type = data.get('type')
+        handler = _WS_MESSAGE_HANDLERS.get(message_type)
         
-        if message_type == 'audio_input':
-            audio_data = data.get('data', [])
-            if audio_data and len(audio_data) > 0:
-                await session.send_audio_input(audio_data)
-            
-        elif message_type == 'text_input':
-            text = data.get('text', '').strip()
-            if text:
-                await session.send_text_input(text)
-            
-        elif message_type == 'ping':
-            # Respond to ping for connection health monitoring
-            await session._broadcast_to_clients({
-                'type': 'pong',
-                'timestamp': datetime.now().isoformat(),
-                'session_id': session.session_id
-            })
-            
-        elif message_type == 'get_status':
-            # Send session status
-            await session._broadcast_to_clients({
-                'type': 'session_status',
-                **session.get_session_info()
-            })
-            
-        else:
+        if handler is None:
             logger.warning(f"Unknown WebSocket message type: {message_type}")
             await session._broadcast_to_clients({
                 'type': 'error',
                 'message': f'Unknown message type: {message_type}'
             })
+            return
+        
+        await handler(session, data)
             
     except Exception as e:
         logger.error(f"Error handling WebSocket message: {e}")
-        await session._broadcast_to_clients({
-            'type': 'error',
-            'message': 'Error processing message'
-        })
+        await session._fan_out(_PROCESSING_ERROR_FRAME, _PROCESSING_ERROR)
 
 # Export main components
 __all__ = [
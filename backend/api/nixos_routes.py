@@ -3,335 +3,364 @@ NixOS Environment Management API Routes
 Provides REST API endpoints for creating, managing, and controlling NixOS environments
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from services.nixos_environment_manager import NixOSEnvironmentManager
+from utils.flask_helpers import (
+    NUMBER, LIST, OBJECT, STRING, STRING_LIST,
+    conditional_json, json_body, register_error_handler, run_async, submit_async, with_etag
+)
 import logging
+import orjson
 import asyncio
 import os
-from typing import List, Dict, Any
+import re
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Any, Callable, Iterator, Mapping, Optional, Tuple
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Create Blueprint
 nixos_bp = Blueprint('nixos', __name__, url_prefix='/api/nixos')
+register_error_handler(nixos_bp)
 
-# Initialize NixOS Environment Manager
-nixos_manager = NixOSEnvironmentManager()
+# NixOS Environment Manager, created on first use so importing the blueprint
+# doesn't probe Docker and Nix
+_nixos_manager: Optional[NixOSEnvironmentManager] = None
+_nixos_manager_lock = threading.Lock()
+
+def _get_nixos_manager() -> NixOSEnvironmentManager:
+    """Return the shared NixOS environment manager, creating it if needed"""
+    global _nixos_manager
+    if _nixos_manager is None:
+        with _nixos_manager_lock:
+            if _nixos_manager is None:
+                _nixos_manager = NixOSEnvironmentManager()
+    return _nixos_manager
+
+# Short-lived caches so bursts of dashboard polls collapse to one lookup;
+# templates only change with a deploy. Clients and proxies may reuse the
+# responses for as long as we would serve them from cache
+TEMPLATES_MAX_AGE = 3600
+STATUS_MAX_AGE = 2
+_templates_cache = TTLCache(maxsize=1, ttl=TEMPLATES_MAX_AGE)
+_status_cache = TTLCache(maxsize=1, ttl=STATUS_MAX_AGE)
+_cache_lock = threading.Lock()
+
+def _cached(cache: TTLCache, key: str, producer: Callable[[], Any]) -> Any:
+    """Return the cached value for key, computing it with producer on a miss"""
+    with _cache_lock:
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = producer()
+            return value
+
+def _invalidate_environments():
+    """Drop the cached status summary after a state-changing call"""
+    with _cache_lock:
+        _status_cache.clear()
+
+# Background sweep of stale environments, so most cleanups never hit the API;
+# the app starts it at initialisation with its configured interval
+CLEANUP_INTERVAL = 3600
+CLEANUP_MAX_AGE_HOURS = 24
+_cleanup_future: Optional[Future] = None
+
+async def _sweep_inactive_environments(max_age_hours: float) -> dict:
+    """Run the cleanup sweep on the shared loop, where its deletions are scheduled as tasks"""
+    result = _get_nixos_manager().cleanup_inactive_environments(max_age_hours)
+    _invalidate_environments()
+    return result
+
+async def _cleanup_inactive_environments_periodically(interval: float):
+    """Clean up inactive environments periodically"""
+    while True:
+        await asyncio.sleep(interval)
+        if _nixos_manager is None:
+            # Nothing has been created yet, so there is nothing to sweep
+            continue
+        try:
+            result = await _sweep_inactive_environments(CLEANUP_MAX_AGE_HOURS)
+            if result.get('total_cleaned'):
+                logger.info(f"🧹 Scheduled cleanup of {result['total_cleaned']} inactive environments")
+        except Exception as e:
+            logger.error("Error in environment cleanup: %s", e, exc_info=e)
+
+def start_environment_cleanup(interval: float = CLEANUP_INTERVAL):
+    """Start the periodic sweep of inactive environments; an interval of 0 disables it"""
+    global _cleanup_future
+    if interval <= 0:
+        logger.info("🧹 Periodic environment cleanup disabled")
+        return
+    if _cleanup_future is not None and not _cleanup_future.done():
+        return
+    _cleanup_future = submit_async(_cleanup_inactive_environments_periodically(interval))
+    logger.info(f"🧹 Periodic environment cleanup every {interval}s")
+
+# Query-string spellings of true, as Werkzeug's bool coercion accepts them
+_TRUTHY = frozenset({'1', 'true', 'yes', 'on', 't', 'y'})
+
+# Per-route body schemas; absent or null fields fall back to the route's defaults
+_CREATE_ENVIRONMENT_SCHEMA = {'template_name': STRING, 'custom_config': OBJECT, 'user_id': STRING}
+_INSTALL_PACKAGES_SCHEMA = {'packages': LIST}
+_EXECUTE_COMMAND_SCHEMA = {'command': STRING, 'working_directory': STRING}
+_CLEANUP_SCHEMA = {'max_age_hours': NUMBER}
+_MAMA_BEAR_SCHEMA = {
+    'project_description': STRING,
+    'project_files': STRING_LIST,
+    'requirements': STRING_LIST,
+    'user_id': STRING
+}
+
+def _build_templates_body() -> Tuple[bytes, str]:
+    """Serialize the templates response once for reuse"""
+    templates = _get_nixos_manager().get_available_templates()
+    return with_etag(orjson.dumps({
+        'success': True,
+        'templates': templates['templates'],
+        'total_templates': templates['total_templates']
+    }))
 
 @nixos_bp.route('/templates', methods=['GET'])
 def get_templates():
     """Get available NixOS environment templates"""
+    body, etag = _cached(_templates_cache, 'templates', _build_templates_body)
+    return conditional_json(body, etag, max_age=TEMPLATES_MAX_AGE)
+
+def _stream_environments(manager: NixOSEnvironmentManager, status: Optional[str] = None) -> Iterator[bytes]:
+    """Emit the environment listing as a JSON document one environment at a time"""
+    yield b'{"success":true,"environments":['
+    total = 0
     try:
-        templates = nixos_manager.get_available_templates()
-        return jsonify({
-            'success': True,
-            'templates': templates['templates'],
-            'total_templates': templates['total_templates']
-        })
+        for environment in manager.iter_environments(status):
+            yield (b',' if total else b'') + orjson.dumps(environment)
+            total += 1
     except Exception as e:
-        logger.error(f"Error getting templates: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        # The 200 status is already sent; abort so the client sees a truncated document
+        logger.error(f"Error listing environments: {e}")
+        raise
+    yield b'],"total_environments":%d}' % total
 
 @nixos_bp.route('/environments', methods=['GET'])
 def list_environments():
     """List all NixOS environments"""
-    try:
-        environments = nixos_manager.list_environments()
-        return jsonify({
-            'success': True,
-            'environments': environments,
-            'total_environments': len(environments)
-        })
-    except Exception as e:
-        logger.error(f"Error listing environments: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    # Create the manager before streaming so a failure still gets an error response
+    manager = _get_nixos_manager()
+    
+    # ?status=active filters in the manager rather than after serialization
+    status = request.args.get('status')
+    return current_app.response_class(_stream_environments(manager, status), mimetype='application/json')
 
 @nixos_bp.route('/environments', methods=['POST'])
-def create_environment():
+@json_body(schema=_CREATE_ENVIRONMENT_SCHEMA)
+def create_environment(data):
     """Create a new NixOS environment"""
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
-        
-        template_name = data.get('template_name')
-        custom_config = data.get('custom_config', {})
-        user_id = data.get('user_id', 'anonymous')
-        
-        if not template_name and not custom_config:
-            return jsonify({
-                'success': False,
-                'error': 'Either template_name or custom_config must be provided'
-            }), 400
-        
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            nixos_manager.create_environment(template_name, custom_config, user_id)
-        )
-        loop.close()
-        
-        if result['success']:
-            return jsonify(result), 201
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        logger.error(f"Error creating environment: {e}")
+    template_name = data.get('template_name')
+    custom_config = data.get('custom_config', {})
+    user_id = data.get('user_id', 'anonymous')
+    
+    if not template_name and not custom_config:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'Either template_name or custom_config must be provided'
+        }), 400
+    
+    result = run_async(_get_nixos_manager().create_environment(template_name, custom_config, user_id))
+    _invalidate_environments()
+    
+    if result['success']:
+        return jsonify(result), 201
+    else:
+        return jsonify(result), 400
 
 @nixos_bp.route('/environments/<environment_id>', methods=['GET'])
 def get_environment_details(environment_id):
     """Get detailed information about a specific environment"""
-    try:
-        result = nixos_manager.get_environment_details(environment_id)
-        
-        if result['success']:
-            return jsonify(result)
-        else:
-            return jsonify(result), 404
-            
-    except Exception as e:
-        logger.error(f"Error getting environment details: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    result = _get_nixos_manager().get_environment_details(environment_id)
+    
+    if result['success']:
+        return jsonify(result)
+    else:
+        return jsonify(result), 404
 
 @nixos_bp.route('/environments/<environment_id>/start', methods=['POST'])
 def start_environment(environment_id):
     """Start a stopped environment"""
-    try:
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            nixos_manager.start_environment(environment_id)
-        )
-        loop.close()
-        
-        if result['success']:
-            return jsonify(result)
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        logger.error(f"Error starting environment: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    result = run_async(_get_nixos_manager().start_environment(environment_id))
+    _invalidate_environments()
+    
+    if result['success']:
+        return jsonify(result)
+    else:
+        return jsonify(result), 400
 
 @nixos_bp.route('/environments/<environment_id>/stop', methods=['POST'])
 def stop_environment(environment_id):
     """Stop a running environment"""
-    try:
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            nixos_manager.stop_environment(environment_id)
-        )
-        loop.close()
-        
-        if result['success']:
-            return jsonify(result)
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        logger.error(f"Error stopping environment: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    result = run_async(_get_nixos_manager().stop_environment(environment_id))
+    _invalidate_environments()
+    
+    if result['success']:
+        return jsonify(result)
+    else:
+        return jsonify(result), 400
 
 @nixos_bp.route('/environments/<environment_id>', methods=['DELETE'])
 def delete_environment(environment_id):
     """Delete an environment"""
-    try:
-        force = request.args.get('force', 'false').lower() == 'true'
-        
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            nixos_manager.delete_environment(environment_id, force)
-        )
-        loop.close()
-        
-        if result['success']:
-            return jsonify(result)
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        logger.error(f"Error deleting environment: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    force = request.args.get('force', '').lower() in _TRUTHY
+    
+    result = run_async(_get_nixos_manager().delete_environment(environment_id, force))
+    _invalidate_environments()
+    
+    if result['success']:
+        return jsonify(result)
+    else:
+        return jsonify(result), 400
 
 @nixos_bp.route('/environments/<environment_id>/packages', methods=['POST'])
-def install_packages(environment_id):
+@json_body('packages', schema=_INSTALL_PACKAGES_SCHEMA)
+def install_packages(data, environment_id):
     """Install additional packages in an environment"""
-    try:
-        data = request.get_json()
-        
-        if not data or 'packages' not in data:
-            return jsonify({
-                'success': False,
-                'error': 'packages list required'
-            }), 400
-        
-        packages = data['packages']
-        if not isinstance(packages, list):
-            return jsonify({
-                'success': False,
-                'error': 'packages must be a list'
-            }), 400
-        
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            nixos_manager.install_package_in_environment(environment_id, packages)
-        )
-        loop.close()
-        
-        if result['success']:
-            return jsonify(result)
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        logger.error(f"Error installing packages: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    packages = data['packages']
+    
+    result = run_async(_get_nixos_manager().install_package_in_environment(environment_id, packages))
+    _invalidate_environments()
+    
+    if result['success']:
+        return jsonify(result)
+    else:
+        return jsonify(result), 400
 
 @nixos_bp.route('/environments/<environment_id>/execute', methods=['POST'])
-def execute_command(environment_id):
+@json_body('command', schema=_EXECUTE_COMMAND_SCHEMA)
+def execute_command(data, environment_id):
     """Execute a command in the environment"""
-    try:
-        data = request.get_json()
-        
-        if not data or 'command' not in data:
-            return jsonify({
-                'success': False,
-                'error': 'command required'
-            }), 400
-        
-        command = data['command']
-        working_directory = data.get('working_directory', '/workspace')
-        
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            nixos_manager.execute_command_in_environment(
-                environment_id, command, working_directory
-            )
+    command = data['command']
+    working_directory = data.get('working_directory', '/workspace')
+    
+    result = run_async(
+        _get_nixos_manager().execute_command_in_environment(
+            environment_id, command, working_directory
         )
-        loop.close()
-        
-        if result['success']:
-            return jsonify(result)
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        logger.error(f"Error executing command: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    )
+    
+    if result['success']:
+        return jsonify(result)
+    else:
+        return jsonify(result), 400
 
 @nixos_bp.route('/environments/cleanup', methods=['POST'])
-def cleanup_environments():
+@json_body(allow_empty=True, schema=_CLEANUP_SCHEMA)
+def cleanup_environments(data):
     """Clean up inactive environments"""
-    try:
-        data = request.get_json() or {}
-        max_age_hours = data.get('max_age_hours', 24)
-        
-        result = nixos_manager.cleanup_inactive_environments(max_age_hours)
-        
-        return jsonify(result)
-        
-    except Exception as e:
-        logger.error(f"Error cleaning up environments: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    max_age_hours = data.get('max_age_hours', CLEANUP_MAX_AGE_HOURS)
+    
+    # The sweep only schedules deletions; they finish on the loop after we respond
+    result = run_async(_sweep_inactive_environments(max_age_hours))
+    
+    return jsonify(result), 202 if result['success'] else 500
 
 @nixos_bp.route('/mama-bear/create-development-environment', methods=['POST'])
-def mama_bear_create_dev_environment():
+@json_body(schema=_MAMA_BEAR_SCHEMA)
+def mama_bear_create_dev_environment(data):
     """Mama Bear's intelligent environment creation based on project analysis"""
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
-        
-        project_description = data.get('project_description', '')
-        project_files = data.get('project_files', [])
-        requirements = data.get('requirements', [])
-        user_id = data.get('user_id', 'mama_bear')
-        
-        # Analyze project requirements and suggest environment
-        suggested_config = _analyze_project_requirements(
-            project_description, project_files, requirements
-        )
-        
-        # Create environment with intelligent configuration
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            nixos_manager.create_environment(
-                template_name=suggested_config['template'],
-                custom_config=suggested_config['config'],
-                user_id=user_id
-            )
-        )
-        loop.close()
-        
-        if result['success']:
-            result['mama_bear_analysis'] = suggested_config['analysis']
-            result['message'] = f"🐻 I've created a perfect environment for your {suggested_config['project_type']} project!"
-            
-        return jsonify(result)
+    project_description = data.get('project_description', '')
+    project_files = data.get('project_files', [])
+    requirements = data.get('requirements', [])
+    user_id = data.get('user_id', 'mama_bear')
+    
+    # Analyze the project and create the suggested environment in one round trip
+    suggested_config, result = run_async(
+        _analyze_and_create_environment(project_description, project_files, requirements, user_id)
+    )
+    _invalidate_environments()
+    
+    if result['success']:
+        result['mama_bear_analysis'] = suggested_config['analysis']
+        result['message'] = f"🐻 I've created a perfect environment for your {suggested_config['project_type']} project!"
         
-    except Exception as e:
-        logger.error(f"Error in Mama Bear environment creation: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return jsonify(result)
+
+_PYTHON_EXTENSIONS = frozenset({'.py', '.pyx'})
+_JAVASCRIPT_EXTENSIONS = frozenset({'.js', '.ts', '.jsx', '.tsx'})
+
+# Description keywords, matched as substrings of the lowercased description
+_JAVASCRIPT_TERMS = frozenset({'javascript', 'typescript', 'node', 'react', 'vue', 'angular'})
+_DESCRIPTION_DETECTIONS = (
+    ('detected_frameworks', (
+        ('react', frozenset({'react', 'next.js', 'nextjs'})),
+        ('vue', frozenset({'vue', 'nuxt'})),
+        ('python_web', frozenset({'django', 'flask', 'fastapi'})),
+        ('node_web', frozenset({'express', 'fastify', 'koa'})),
+    )),
+    ('detected_databases', (
+        ('postgresql', frozenset({'postgres', 'postgresql'})),
+        ('mysql', frozenset({'mysql', 'mariadb'})),
+        ('redis', frozenset({'redis', 'cache'})),
+        ('mongodb', frozenset({'mongodb', 'mongo'})),
+    )),
+    ('detected_tools', (
+        ('docker', frozenset({'docker', 'container'})),
+        ('kubernetes', frozenset({'kubernetes', 'k8s'})),
+        ('terraform', frozenset({'terraform', 'infrastructure'})),
+    )),
+)
+_PROJECT_TYPE_TERMS = (
+    ('web_development', frozenset({'web app', 'website', 'frontend', 'backend', 'api'})),
+    ('data_science', frozenset({'data science', 'machine learning', 'ai', 'ml', 'analysis'})),
+    ('devops', frozenset({'devops', 'infrastructure', 'deployment', 'ci/cd'})),
+    ('mobile_development', frozenset({'mobile', 'ios', 'android'})),
+)
+_ALL_DESCRIPTION_TERMS = frozenset().union(
+    {'python', 'rust', 'golang'},
+    _JAVASCRIPT_TERMS,
+    *(terms for _, detections in _DESCRIPTION_DETECTIONS for _, terms in detections),
+    *(terms for _, terms in _PROJECT_TYPE_TERMS),
+)
+# Zero-width lookahead so overlapping keywords are all found ('ai' inside
+# 'mariadb' counts, as it did with substring checks); longest first so a term
+# that is a prefix of another (postgres/postgresql) only loses to a synonym
+_DESCRIPTION_TERM_RE = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(_ALL_DESCRIPTION_TERMS, key=len, reverse=True))) + '))'
+)
 
-def _analyze_project_requirements(project_description: str, project_files: List[str], requirements: List[str]) -> dict:
+_TEMPLATE_BY_PROJECT_TYPE = {
+    'web_development': 'full_stack_web',
+    'data_science': 'data_science',
+    'devops': 'devops_infrastructure',
+    'mobile_development': 'development_minimal'
+}
+
+# Nix packages added for each detected language, database and tool
+_DETECTION_PACKAGES = {
+    'python': ('python3', 'python3Packages.pip', 'python3Packages.virtualenv'),
+    'javascript': ('nodejs_20', 'yarn', 'bun'),
+    'rust': ('rustc', 'cargo'),
+    'golang': ('go',),
+    'postgresql': ('postgresql',),
+    'redis': ('redis',),
+    'docker': ('docker', 'docker-compose'),
+    'kubernetes': ('kubectl', 'helm'),
+    'terraform': ('terraform',),
+}
+
+_RESOURCE_LIMITS = {
+    'high': {'memory': '6GB', 'cpu': '3', 'disk': '30GB'},
+    'medium': {'memory': '4GB', 'cpu': '2', 'disk': '20GB'},
+    'low': {'memory': '2GB', 'cpu': '1', 'disk': '10GB'},
+}
+
+def _analyze_project_requirements(project_description: str, project_files: List[str], requirements: List[str]) -> Mapping[str, Any]:
     """Analyze project requirements and suggest optimal environment configuration"""
     
-    project_description_lower = project_description.lower()
-    file_extensions = [os.path.splitext(f)[1] for f in project_files]
+    # Normalize once: casefold and collapse whitespace so 'web  app' still matches 'web app'
+    project_description_lower = ' '.join(project_description.casefold().split())
+    file_extensions = frozenset(os.path.splitext(f)[1] for f in project_files)
     
     # Initialize analysis result
     analysis = {
@@ -343,64 +372,33 @@ def _analyze_project_requirements(project_description: str, project_files: List[
         'complexity': 'medium'
     }
     
+    # One scan of the description finds every keyword it contains
+    hits = set(_DESCRIPTION_TERM_RE.findall(project_description_lower))
+    
     # Language detection
-    if any(ext in ['.py', '.pyx'] for ext in file_extensions) or 'python' in project_description_lower:
+    if not file_extensions.isdisjoint(_PYTHON_EXTENSIONS) or 'python' in hits:
         analysis['detected_languages'].append('python')
     
-    if any(ext in ['.js', '.ts', '.jsx', '.tsx'] for ext in file_extensions) or any(term in project_description_lower for term in ['javascript', 'typescript', 'node', 'react', 'vue', 'angular']):
+    if not file_extensions.isdisjoint(_JAVASCRIPT_EXTENSIONS) or not hits.isdisjoint(_JAVASCRIPT_TERMS):
         analysis['detected_languages'].append('javascript')
     
-    if any(ext in ['.rs'] for ext in file_extensions) or 'rust' in project_description_lower:
+    if '.rs' in file_extensions or 'rust' in hits:
         analysis['detected_languages'].append('rust')
     
-    if any(ext in ['.go'] for ext in file_extensions) or 'golang' in project_description_lower:
+    if '.go' in file_extensions or 'golang' in hits:
         analysis['detected_languages'].append('golang')
     
-    # Framework detection
-    if any(term in project_description_lower for term in ['react', 'next.js', 'nextjs']):
-        analysis['detected_frameworks'].append('react')
-    
-    if any(term in project_description_lower for term in ['vue', 'nuxt']):
-        analysis['detected_frameworks'].append('vue')
-    
-    if any(term in project_description_lower for term in ['django', 'flask', 'fastapi']):
-        analysis['detected_frameworks'].append('python_web')
-    
-    if any(term in project_description_lower for term in ['express', 'fastify', 'koa']):
-        analysis['detected_frameworks'].append('node_web')
-    
-    # Database detection
-    if any(term in project_description_lower for term in ['postgres', 'postgresql']):
-        analysis['detected_databases'].append('postgresql')
-    
-    if any(term in project_description_lower for term in ['mysql', 'mariadb']):
-        analysis['detected_databases'].append('mysql')
-    
-    if any(term in project_description_lower for term in ['redis', 'cache']):
-        analysis['detected_databases'].append('redis')
-    
-    if any(term in project_description_lower for term in ['mongodb', 'mongo']):
-        analysis['detected_databases'].append('mongodb')
+    # Framework, database and tool detection
+    for bucket, detections in _DESCRIPTION_DETECTIONS:
+        for tag, terms in detections:
+            if not hits.isdisjoint(terms):
+                analysis[bucket].append(tag)
     
-    # Tool detection
-    if any(term in project_description_lower for term in ['docker', 'container']):
-        analysis['detected_tools'].append('docker')
-    
-    if any(term in project_description_lower for term in ['kubernetes', 'k8s']):
-        analysis['detected_tools'].append('kubernetes')
-    
-    if any(term in project_description_lower for term in ['terraform', 'infrastructure']):
-        analysis['detected_tools'].append('terraform')
-    
-    # Project type determination
-    if any(term in project_description_lower for term in ['web app', 'website', 'frontend', 'backend', 'api']):
-        analysis['project_type'] = 'web_development'
-    elif any(term in project_description_lower for term in ['data science', 'machine learning', 'ai', 'ml', 'analysis']):
-        analysis['project_type'] = 'data_science'
-    elif any(term in project_description_lower for term in ['devops', 'infrastructure', 'deployment', 'ci/cd']):
-        analysis['project_type'] = 'devops'
-    elif any(term in project_description_lower for term in ['mobile', 'ios', 'android']):
-        analysis['project_type'] = 'mobile_development'
+    # Project type determination; the first matching type wins
+    for project_type, terms in _PROJECT_TYPE_TERMS:
+        if not hits.isdisjoint(terms):
+            analysis['project_type'] = project_type
+            break
     
     # Complexity assessment
     complexity_indicators = len(analysis['detected_languages']) + len(analysis['detected_frameworks']) + len(analysis['detected_databases']) + len(analysis['detected_tools'])
@@ -413,89 +411,92 @@ def _analyze_project_requirements(project_description: str, project_files: List[
         analysis['complexity'] = 'low'
     
     # Template selection
-    template_mapping = {
-        'web_development': 'full_stack_web',
-        'data_science': 'data_science',
-        'devops': 'devops_infrastructure',
-        'mobile_development': 'development_minimal'
-    }
-    
-    selected_template = template_mapping.get(analysis['project_type'], 'development_minimal')
+    selected_template = _TEMPLATE_BY_PROJECT_TYPE.get(analysis['project_type'], 'development_minimal')
     
     # Custom configuration
     custom_packages = []
     custom_env_vars = {}
     custom_hooks = []
     
-    # Add language-specific packages
-    if 'python' in analysis['detected_languages']:
-        custom_packages.extend(['python3', 'python3Packages.pip', 'python3Packages.virtualenv'])
+    # Add language, database and tool packages in detection order
+    for detected in ('detected_languages', 'detected_databases', 'detected_tools'):
+        for tag in analysis[detected]:
+            custom_packages.extend(_DETECTION_PACKAGES.get(tag, ()))
     
-    if 'javascript' in analysis['detected_languages']:
-        custom_packages.extend(['nodejs_20', 'yarn', 'bun'])
-    
-    if 'rust' in analysis['detected_languages']:
-        custom_packages.extend(['rustc', 'cargo'])
-    
-    if 'golang' in analysis['detected_languages']:
-        custom_packages.extend(['go'])
-    
-    # Add database packages
     if 'postgresql' in analysis['detected_databases']:
-        custom_packages.append('postgresql')
         custom_env_vars['DATABASE_URL'] = 'postgresql://localhost:5432/dev'
     
-    if 'redis' in analysis['detected_databases']:
-        custom_packages.append('redis')
-    
-    # Add tool packages
-    if 'docker' in analysis['detected_tools']:
-        custom_packages.extend(['docker', 'docker-compose'])
-    
-    if 'kubernetes' in analysis['detected_tools']:
-        custom_packages.extend(['kubectl', 'helm'])
-    
-    if 'terraform' in analysis['detected_tools']:
-        custom_packages.append('terraform')
-    
-    return {
+    # The result is memoized and shared, so it is built from immutable parts
+    return MappingProxyType({
         'template': selected_template,
         'project_type': analysis['project_type'],
-        'analysis': analysis,
-        'config': {
+        'analysis': MappingProxyType({
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in analysis.items()
+        }),
+        'config': MappingProxyType({
             'name': f"Smart Environment - {analysis['project_type'].replace('_', ' ').title()}",
             'description': f"Intelligently configured environment for {project_description}",
-            'packages': custom_packages,
-            'environment_variables': custom_env_vars,
-            'shell_hooks': custom_hooks,
-            'resource_limits': {
-                'memory': '6GB' if analysis['complexity'] == 'high' else '4GB' if analysis['complexity'] == 'medium' else '2GB',
-                'cpu': '3' if analysis['complexity'] == 'high' else '2' if analysis['complexity'] == 'medium' else '1',
-                'disk': '30GB' if analysis['complexity'] == 'high' else '20GB' if analysis['complexity'] == 'medium' else '10GB'
-            }
+            'packages': tuple(custom_packages),
+            'environment_variables': MappingProxyType(custom_env_vars),
+            'shell_hooks': tuple(custom_hooks),
+            'resource_limits': MappingProxyType(_RESOURCE_LIMITS[analysis['complexity']])
+        })
+    })
+
+def _build_status_body() -> Tuple[bytes, str]:
+    """Serialize the manager status response once for reuse"""
+    manager = _get_nixos_manager()
+    return with_etag(orjson.dumps({
+        'success': True,
+        'status': 'ready',
+        'nix_available': manager.nix_available,
+        'docker_available': manager.docker_client is not None,
+        'total_environments': manager.count_environments(),
+        'active_environments': manager.count_active(),
+        'base_path': manager.environments_base_path
+    }))
+
+@lru_cache(maxsize=1024)
+def _analyze_memoized(project_description: str, project_files: Tuple[str, ...], requirements: Tuple[str, ...]) -> Mapping[str, Any]:
+    """Memoized analysis keyed on the request inputs"""
+    return _analyze_project_requirements(project_description, list(project_files), list(requirements))
+
+def _analyze_project_requirements_cached(project_description: str, project_files: List[str], requirements: List[str]) -> dict:
+    """Analyze project requirements, reusing the result for repeated inputs"""
+    suggestion = _analyze_memoized(project_description, tuple(project_files), tuple(requirements))
+    
+    # The environment keeps the config and its containers, so only those are copied
+    config = suggestion['config']
+    return {
+        'template': suggestion['template'],
+        'project_type': suggestion['project_type'],
+        'analysis': dict(suggestion['analysis']),
+        'config': {
+            **config,
+            'packages': list(config['packages']),
+            'environment_variables': dict(config['environment_variables']),
+            'shell_hooks': list(config['shell_hooks']),
+            'resource_limits': dict(config['resource_limits'])
         }
     }
 
+async def _analyze_and_create_environment(project_description: str, project_files: List[str], requirements: List[str], user_id: str) -> Tuple[dict, dict]:
+    """Analyze project requirements off the loop, then create the suggested environment"""
+    suggested_config = await asyncio.to_thread(
+        _analyze_project_requirements_cached, project_description, project_files, requirements
+    )
+    
+    # Create environment with intelligent configuration
+    result = await _get_nixos_manager().create_environment(
+        template_name=suggested_config['template'],
+        custom_config=suggested_config['config'],
+        user_id=user_id
+    )
+    return suggested_config, result
+
 @nixos_bp.route('/status', methods=['GET'])
 def get_nixos_status():
     """Get NixOS environment manager status"""
-    try:
-        environments = nixos_manager.list_environments()
-        active_count = len([env for env in environments if env['status'] == 'active'])
-        
-        return jsonify({
-            'success': True,
-            'status': 'ready',
-            'nix_available': nixos_manager.nix_available,
-            'docker_available': nixos_manager.docker_client is not None,
-            'total_environments': len(environments),
-            'active_environments': active_count,
-            'base_path': nixos_manager.environments_base_path
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting NixOS status: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
\ No newline at end of file
+    body, etag = _cached(_status_cache, 'status', _build_status_body)
+    return conditional_json(body, etag, max_age=STATUS_MAX_AGE)
@@ -34,11 +34,12 @@ from services.vertex_ai_agent_manager import VertexAIAgentManager
 from models.database import init_database
 from utils.memory_manager import MemoryManager
 from utils.logging_setup import setup_logging
+from utils.json_provider import OrjsonProvider
 
 # Import API routes
 from api.mcp_routes import mcp_bp, init_mcp_routes
 from api.workspace_routes import workspace_bp, init_workspace_routes
-from api.nixos_routes import nixos_bp
+from api.nixos_routes import nixos_bp, start_environment_cleanup
 from api.code_server_routes import code_server_bp
 from api.orchestrator_routes import orchestrator_bp
 from api.gemini_live_routes import gemini_live_bp, init_gemini_live_service
@@ -99,11 +100,13 @@ class ServiceManager:
 
 # Initialize Flask app with enhanced configuration
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config.update({
     'SECRET_KEY': os.getenv('SECRET_KEY', 'sanctuary_mama_bear_secret_dev'),
     'MAX_CONTENT_LENGTH': 16 * 1024 * 1024,  # 16MB max file upload
     'JSON_SORT_KEYS': False,
-    'JSONIFY_PRETTYPRINT_REGULAR': True if os.getenv('FLASK_ENV') == 'development' else False
+    'JSONIFY_PRETTYPRINT_REGULAR': True if os.getenv('FLASK_ENV') == 'development' else False,
+    'NIXOS_CLEANUP_INTERVAL': float(os.getenv('NIXOS_CLEANUP_INTERVAL', 3600))  # seconds; 0 disables
 })
 
 # Configure CORS with enhanced origins
@@ -594,6 +597,9 @@ def run_background_tasks():
     # Start background thread
     background_thread = threading.Thread(target=background_loop, daemon=True)
     background_thread.start()
+    
+    # Sweep inactive NixOS environments on the shared event loop
+    start_environment_cleanup(app.config['NIXOS_CLEANUP_INTERVAL'])
     logger.info("🔄 Background tasks started")
 
 if __name__ == '__main__':
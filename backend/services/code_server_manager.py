@@ -11,8 +11,9 @@ import subprocess
 import tempfile
 import shutil
 import socket
+import itertools
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterator
 from pathlib import Path
 import docker
 import yaml
@@ -49,6 +50,9 @@ class CodeServerManager:
         self.code_server_image = "codercom/code-server:latest"
         self.instances_base_path = "/tmp/code_server_instances"
         
+        # Atomic counter for default instance names
+        self._name_counter = itertools.count(1)
+        
         # Google Cloud configuration
         self.gcp_project_id = os.getenv('PRIMARY_SERVICE_ACCOUNT_PROJECT_ID', 'podplay-build-alpha')
         self.gcp_region = 'us-central1'
@@ -214,7 +218,7 @@ class CodeServerManager:
         """Create a new code-server instance"""
         
         try:
-            instance_name = config.get('name', f"code_server_{int(datetime.now().timestamp())}")
+            instance_name = config.get('name') or f"Code Server {next(self._name_counter)}"
             environment_id = config.get('environment_id')
             workspace_path = config.get('workspace_path', '/workspace')
             extensions = config.get('extensions', [])
@@ -422,7 +426,9 @@ CMD ["code-server", "--bind-addr", "0.0.0.0:{port}", "/workspace"]
             image_tag = f"code-server-{instance.id}"
             
             try:
-                image, build_logs = self.docker_client.images.build(
+                # Docker SDK calls block, so run them off the event loop
+                image, build_logs = await asyncio.to_thread(
+                    self.docker_client.images.build,
                     path=docker_config['instance_path'],
                     tag=image_tag,
                     rm=True
@@ -439,7 +445,8 @@ CMD ["code-server", "--bind-addr", "0.0.0.0:{port}", "/workspace"]
             
             # Start container
             try:
-                container = self.docker_client.containers.run(
+                container = await asyncio.to_thread(
+                    self.docker_client.containers.run,
                     image_tag,
                     name=instance.id,
                     detach=True,
@@ -498,11 +505,12 @@ CMD ["code-server", "--bind-addr", "0.0.0.0:{port}", "/workspace"]
         logger.warning(f"⚠️ Code-server not ready within timeout: {instance.id}")
         return False
     
-    def list_instances(self) -> List[dict]:
-        """List all code-server instances"""
+    def iter_instances(self) -> Iterator[dict]:
+        """Yield a summary of each code-server instance without building a list"""
         
-        return [
-            {
+        # Snapshot the items so concurrent creations don't break iteration
+        for instance_id, instance in list(self.instances.items()):
+            yield {
                 'id': instance_id,
                 'name': instance.name,
                 'status': instance.status,
@@ -513,8 +521,16 @@ CMD ["code-server", "--bind-addr", "0.0.0.0:{port}", "/workspace"]
                 'environment_id': instance.environment_id,
                 'extensions_count': len(instance.extensions)
             }
-            for instance_id, instance in self.instances.items()
-        ]
+    
+    def list_instances(self) -> List[dict]:
+        """List all code-server instances"""
+        
+        return list(self.iter_instances())
+    
+    def get_extension_catalog(self) -> Dict[str, dict]:
+        """Get the catalog of available VSCode extensions"""
+        
+        return self.extension_catalog
     
     def get_instance_details(self, instance_id: str) -> dict:
         """Get detailed information about an instance"""
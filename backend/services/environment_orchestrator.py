@@ -7,14 +7,17 @@ import os
 import logging
 import json
 import asyncio
+import copy
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import docker
 import yaml
 import tempfile
+import threading
+from collections import Counter
 from pathlib import Path
 
 from .nixos_environment_manager import NixOSEnvironmentManager
@@ -39,6 +42,9 @@ class EnvironmentStatus(Enum):
     STOPPED = "stopped"
     ERROR = "error"
 
+class EnvironmentNotFound(Exception):
+    """Raised when an operation names an environment the orchestrator doesn't manage"""
+
 @dataclass
 class EnvironmentTemplate:
     """Template for creating standardized environments"""
@@ -75,6 +81,26 @@ class ManagedEnvironment:
     auto_scaling_enabled: bool
     health_status: Dict[str, Any]
     cost_tracking: Dict[str, Any]
+    # 'web' or 'local' per endpoint name, classified once when endpoints are set
+    endpoint_types: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # Membership index for collaborators; the list keeps their order for clients
+        self._collaborator_set = set(self.collaborators)
+
+    def add_collaborator(self, collaborator: str) -> bool:
+        """Add a collaborator unless already present; returns whether it was added"""
+        if collaborator in self._collaborator_set:
+            return False
+        self._collaborator_set.add(collaborator)
+        self.collaborators.append(collaborator)
+        return True
+
+_WEB_PREFIXES = ('http://', 'https://')
+
+def classify_endpoint(url: str) -> str:
+    """Whether an endpoint URL is reachable over the web or only locally"""
+    return 'web' if url.startswith(_WEB_PREFIXES) else 'local'
 
 class EnvironmentOrchestrator:
     """
@@ -84,7 +110,16 @@ class EnvironmentOrchestrator:
     
     def __init__(self):
         self.environments: Dict[str, ManagedEnvironment] = {}
+        # Registered environments per status, kept in step with the registry
+        self.status_counts: Counter = Counter()
+        # Memory (MiB) and CPU (millicores) held by ready environments, maintained
+        # alongside the counts; integer units so the running totals never drift
+        self._ready_memory_mib = 0
+        self._ready_cpu_millicores = 0
+        self._status_lock = threading.Lock()
         self.templates: Dict[str, EnvironmentTemplate] = {}
+        # Bumped on every template change so callers can tell when derived views are stale
+        self.templates_version = 0
         self.resource_limits = {
             'max_environments_per_user': 5,
             'max_total_environments': 50,
@@ -276,6 +311,7 @@ class EnvironmentOrchestrator:
         }
         
         self.templates.update(templates)
+        self.templates_version += 1
         logger.info(f"✅ Loaded {len(templates)} environment templates")
 
     async def create_environment(self, request: Dict[str, Any]) -> Dict[str, Any]:
@@ -331,7 +367,7 @@ class EnvironmentOrchestrator:
             )
             
             # Register environment
-            self.environments[env_id] = managed_env
+            self._register_environment(managed_env)
             
             # Start provisioning asynchronously
             asyncio.create_task(self._provision_environment(env_id))
@@ -354,7 +390,7 @@ class EnvironmentOrchestrator:
             env = self.environments[env_id]
             template = self.templates[env.template_id]
             
-            env.status = EnvironmentStatus.PROVISIONING
+            self._set_status(env, EnvironmentStatus.PROVISIONING)
             logger.info(f"🔧 Provisioning environment: {env.name} ({env.type.value})")
             
             # Provision based on environment type
@@ -370,8 +406,12 @@ class EnvironmentOrchestrator:
                 raise ValueError(f"Unsupported environment type: {env.type}")
             
             if result['success']:
-                env.status = EnvironmentStatus.READY
-                env.endpoints.update(result.get('endpoints', {}))
+                self._set_status(env, EnvironmentStatus.READY)
+                endpoints = result.get('endpoints', {})
+                env.endpoints.update(endpoints)
+                env.endpoint_types.update(
+                    (name, classify_endpoint(url)) for name, url in endpoints.items() if url
+                )
                 env.metadata.update({
                     'provisioning_complete': datetime.now().isoformat(),
                     'provisioning_result': result
@@ -391,14 +431,14 @@ class EnvironmentOrchestrator:
                 })
                 
             else:
-                env.status = EnvironmentStatus.ERROR
+                self._set_status(env, EnvironmentStatus.ERROR)
                 env.metadata['provisioning_error'] = result.get('error', 'Unknown error')
                 logger.error(f"❌ Environment provisioning failed: {env.name}")
                 
         except Exception as e:
             logger.error(f"❌ Environment provisioning failed: {e}")
             if env_id in self.environments:
-                self.environments[env_id].status = EnvironmentStatus.ERROR
+                self._set_status(self.environments[env_id], EnvironmentStatus.ERROR)
                 self.environments[env_id].metadata['provisioning_error'] = str(e)
 
     async def _provision_nixos_environment(self, env: ManagedEnvironment, template: EnvironmentTemplate) -> Dict[str, Any]:
@@ -699,7 +739,7 @@ WORKDIR /workspace
         """Scale environment up or down"""
         try:
             env = self.environments[env_id]
-            env.status = EnvironmentStatus.SCALING
+            self._set_status(env, EnvironmentStatus.SCALING)
             
             logger.info(f"📈 Scaling environment {direction}: {env.name}")
             
@@ -707,14 +747,14 @@ WORKDIR /workspace
             # For now, just update status
             
             await asyncio.sleep(2)  # Simulate scaling time
-            env.status = EnvironmentStatus.READY
+            self._set_status(env, EnvironmentStatus.READY)
             
             logger.info(f"✅ Environment scaled {direction}: {env.name}")
             
         except Exception as e:
             logger.error(f"❌ Environment scaling failed: {e}")
             if env_id in self.environments:
-                self.environments[env_id].status = EnvironmentStatus.ERROR
+                self._set_status(self.environments[env_id], EnvironmentStatus.ERROR)
 
     async def _notify_mama_bear(self, env_id: str, event_type: str, data: Dict[str, Any]):
         """Notify Mama Bear about environment events"""
@@ -744,6 +784,51 @@ WORKDIR /workspace
         
         return merged
 
+    @staticmethod
+    def _resource_footprint(env: ManagedEnvironment) -> Tuple[int, int]:
+        """Memory in MiB and CPU in millicores requested by an environment"""
+        try:
+            memory_mib = round(float(env.resources.get('memory', '0Gi').replace('Gi', '')) * 1024)
+            cpu_millicores = round(float(env.resources.get('cpu', '0m').replace('m', '')))
+        except ValueError:
+            logger.warning(f"Unrecognized resource units for environment {env.id}: {env.resources}")
+            return 0, 0
+        return memory_mib, cpu_millicores
+
+    def _track_ready(self, env: ManagedEnvironment, sign: int):
+        """Add (sign=1) or remove (sign=-1) an environment's resources from the ready totals"""
+        memory_mib, cpu_millicores = self._resource_footprint(env)
+        self._ready_memory_mib += sign * memory_mib
+        self._ready_cpu_millicores += sign * cpu_millicores
+
+    def _register_environment(self, env: ManagedEnvironment):
+        """Add an environment to the registry and the status counts"""
+        with self._status_lock:
+            self.environments[env.id] = env
+            self.status_counts[env.status] += 1
+            if env.status == EnvironmentStatus.READY:
+                self._track_ready(env, 1)
+
+    def _unregister_environment(self, env_id: str):
+        """Remove an environment from the registry and the status counts"""
+        with self._status_lock:
+            env = self.environments.pop(env_id)
+            self.status_counts[env.status] -= 1
+            if env.status == EnvironmentStatus.READY:
+                self._track_ready(env, -1)
+
+    def _set_status(self, env: ManagedEnvironment, status: EnvironmentStatus):
+        """Change an environment's status, keeping the counts in step"""
+        with self._status_lock:
+            if self.environments.get(env.id) is env and env.status != status:
+                self.status_counts[env.status] -= 1
+                self.status_counts[status] += 1
+                if env.status == EnvironmentStatus.READY:
+                    self._track_ready(env, -1)
+                elif status == EnvironmentStatus.READY:
+                    self._track_ready(env, 1)
+            env.status = status
+
     def _error_response(self, message: str) -> Dict[str, Any]:
         """Generate standardized error response"""
         return {
@@ -769,6 +854,29 @@ WORKDIR /workspace
             'cost_estimate': self._calculate_cost_estimate(env)
         }
 
+    async def restart_environment(self, env_id: str) -> Dict[str, Any]:
+        """Recreate an environment from its configuration; raises EnvironmentNotFound if it doesn't exist"""
+        env = self.environments.get(env_id)
+        if env is None:
+            raise EnvironmentNotFound(env_id)
+        
+        # For now, this will recreate the environment
+        # In a full implementation, this would restart existing resources
+        return await self.create_environment({
+            'template_id': env.template_id,
+            'name': f"{env.name}_restarted",
+            'config': copy.deepcopy(env.config),
+            'owner': env.owner,
+            'collaborators': list(env.collaborators)
+        })
+
+    async def scale_environment(self, env_id: str, direction: str):
+        """Scale an existing environment; raises EnvironmentNotFound if it doesn't exist"""
+        if env_id not in self.environments:
+            raise EnvironmentNotFound(env_id)
+        
+        await self._scale_environment(env_id, direction)
+
     async def list_environments(self, owner: str = None) -> Dict[str, Any]:
         """List all environments, optionally filtered by owner"""
         environments = list(self.environments.values())
@@ -783,6 +891,13 @@ WORKDIR /workspace
             'resource_usage': self._calculate_total_resource_usage()
         }
 
+    async def get_resource_usage_summary(self) -> Dict[str, Any]:
+        """Aggregate resource usage without listing every environment"""
+        return {
+            'resource_usage': self._calculate_total_resource_usage(),
+            'total_count': len(self.environments)
+        }
+
     async def stop_environment(self, env_id: str) -> Dict[str, Any]:
         """Stop an environment"""
         try:
@@ -790,7 +905,7 @@ WORKDIR /workspace
                 return self._error_response("Environment not found")
             
             env = self.environments[env_id]
-            env.status = EnvironmentStatus.STOPPING
+            self._set_status(env, EnvironmentStatus.STOPPING)
             
             logger.info(f"⏹️ Stopping environment: {env.name}")
             
@@ -806,7 +921,7 @@ WORKDIR /workspace
                 # Stop NixOS environment
                 await self.nixos_manager.stop_environment(env_id)
             
-            env.status = EnvironmentStatus.STOPPED
+            self._set_status(env, EnvironmentStatus.STOPPED)
             
             return {
                 'success': True,
@@ -845,7 +960,7 @@ WORKDIR /workspace
                 await self.nixos_manager.delete_environment(env_id, force=force)
             
             # Remove from registry
-            del self.environments[env_id]
+            self._unregister_environment(env_id)
             
             return {
                 'success': True,
@@ -857,6 +972,11 @@ WORKDIR /workspace
             logger.error(f"❌ Failed to delete environment: {e}")
             return self._error_response(f"Failed to delete environment: {str(e)}")
 
+    def add_template(self, template: EnvironmentTemplate):
+        """Register a template, replacing any with the same id"""
+        self.templates[template.id] = template
+        self.templates_version += 1
+
     def get_available_templates(self) -> Dict[str, Any]:
         """Get all available environment templates"""
         return {
@@ -918,24 +1038,16 @@ WORKDIR /workspace
 
     def _calculate_total_resource_usage(self) -> Dict[str, Any]:
         """Calculate total resource usage across all environments"""
-        total_memory = 0
-        total_cpu = 0
-        running_count = 0
-        
-        for env in self.environments.values():
-            if env.status == EnvironmentStatus.READY:
-                running_count += 1
-                memory_gb = float(env.resources.get('memory', '0Gi').replace('Gi', ''))
-                cpu_cores = float(env.resources.get('cpu', '0m').replace('m', '')) / 1000
-                
-                total_memory += memory_gb
-                total_cpu += cpu_cores
+        with self._status_lock:
+            running_count = self.status_counts[EnvironmentStatus.READY]
+            total_memory_mib = self._ready_memory_mib
+            total_cpu_millicores = self._ready_cpu_millicores
         
         return {
             'total_environments': len(self.environments),
             'running_environments': running_count,
-            'total_memory_gb': total_memory,
-            'total_cpu_cores': total_cpu,
+            'total_memory_gb': total_memory_mib / 1024,
+            'total_cpu_cores': total_cpu_millicores / 1000,
             'resource_utilization': f"{running_count}/{self.resource_limits['max_total_environments']}"
         }
 
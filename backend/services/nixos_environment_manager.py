@@ -11,8 +11,10 @@ import asyncio
 import subprocess
 import tempfile
 import shutil
+import threading
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 from pathlib import Path
 import docker
 from dataclasses import dataclass, asdict
@@ -41,6 +43,9 @@ class NixOSEnvironmentManager:
     
     def __init__(self):
         self.environments = {}
+        # Registered environments per status, kept in step with the registry
+        self.status_counts: Counter = Counter()
+        self._status_lock = threading.Lock()
         self.templates = self._load_environment_templates()
         self.docker_client = None
         self.nix_store_path = "/nix/store"
@@ -254,7 +259,7 @@ class NixOSEnvironmentManager:
             
             if build_result['success']:
                 environment.status = 'active'
-                self.environments[env_id] = environment
+                self._register_environment(environment)
                 
                 logger.info(f"✅ NixOS environment created successfully: {env_id}")
                 
@@ -575,7 +580,9 @@ volumes:
             # Build using nix-shell
             build_cmd = ['nix-shell', '--pure', os.path.join(env_path, 'shell.nix'), '--run', 'echo "Build successful"']
             
-            result = subprocess.run(
+            # Blocking calls run off the event loop so other requests keep moving
+            result = await asyncio.to_thread(
+                subprocess.run,
                 build_cmd,
                 cwd=env_path,
                 capture_output=True,
@@ -627,7 +634,9 @@ volumes:
             logger.info(f"🐳 Building containerized environment: {environment.id}")
             
             # Build Docker image
-            image, build_logs = self.docker_client.images.build(
+            # Docker SDK calls block, so run them off the event loop
+            image, build_logs = await asyncio.to_thread(
+                self.docker_client.images.build,
                 path=env_path,
                 tag=f"nixos-env-{environment.id}",
                 rm=True
@@ -636,7 +645,8 @@ volumes:
             logger.info(f"✅ Docker image built: {image.id}")
             
             # Create and start container
-            container = self.docker_client.containers.run(
+            container = await asyncio.to_thread(
+                self.docker_client.containers.run,
                 image.id,
                 name=environment.id,
                 detach=True,
@@ -698,9 +708,9 @@ volumes:
             if self.docker_client:
                 # Start Docker container
                 try:
-                    container = self.docker_client.containers.get(environment_id)
-                    container.start()
-                    environment.status = 'active'
+                    container = await asyncio.to_thread(self.docker_client.containers.get, environment_id)
+                    await asyncio.to_thread(container.start)
+                    self._set_status(environment, 'active')
                     environment.last_updated = datetime.now().isoformat()
                     
                     return {
@@ -715,7 +725,7 @@ volumes:
                     }
             else:
                 # For native Nix environments, they're always "active" once built
-                environment.status = 'active'
+                self._set_status(environment, 'active')
                 environment.last_updated = datetime.now().isoformat()
                 
                 return {
@@ -748,9 +758,9 @@ volumes:
             if self.docker_client:
                 # Stop Docker container
                 try:
-                    container = self.docker_client.containers.get(environment_id)
-                    container.stop()
-                    environment.status = 'stopped'
+                    container = await asyncio.to_thread(self.docker_client.containers.get, environment_id)
+                    await asyncio.to_thread(container.stop)
+                    self._set_status(environment, 'stopped')
                     environment.last_updated = datetime.now().isoformat()
                     
                     return {
@@ -765,7 +775,7 @@ volumes:
                     }
             else:
                 # For native Nix environments, mark as stopped
-                environment.status = 'stopped'
+                self._set_status(environment, 'stopped')
                 environment.last_updated = datetime.now().isoformat()
                 
                 return {
@@ -803,13 +813,13 @@ volumes:
             if self.docker_client:
                 try:
                     # Remove container
-                    container = self.docker_client.containers.get(environment_id)
-                    container.remove(force=force)
+                    container = await asyncio.to_thread(self.docker_client.containers.get, environment_id)
+                    await asyncio.to_thread(container.remove, force=force)
                     
                     # Remove image
                     image_tag = f"nixos-env-{environment_id}"
                     try:
-                        self.docker_client.images.remove(image_tag, force=force)
+                        await asyncio.to_thread(self.docker_client.images.remove, image_tag, force=force)
                     except docker.errors.ImageNotFound:
                         pass
                         
@@ -819,10 +829,10 @@ volumes:
             # Remove environment directory
             env_path = os.path.join(self.environments_base_path, environment_id)
             if os.path.exists(env_path):
-                shutil.rmtree(env_path)
+                await asyncio.to_thread(shutil.rmtree, env_path)
             
             # Remove from registry
-            del self.environments[environment_id]
+            self._unregister_environment(environment_id)
             
             logger.info(f"✅ Environment deleted: {environment_id}")
             
@@ -839,11 +849,37 @@ volumes:
                 'error': str(e)
             }
     
-    def list_environments(self) -> List[dict]:
-        """List all environments"""
+    def _register_environment(self, environment: NixEnvironment):
+        """Add an environment to the registry and the status counts"""
+        
+        with self._status_lock:
+            self.environments[environment.id] = environment
+            self.status_counts[environment.status] += 1
+    
+    def _unregister_environment(self, environment_id: str):
+        """Remove an environment from the registry and the status counts"""
+        
+        with self._status_lock:
+            environment = self.environments.pop(environment_id)
+            self.status_counts[environment.status] -= 1
+    
+    def _set_status(self, environment: NixEnvironment, status: str):
+        """Change an environment's status, keeping the counts in step"""
+        
+        with self._status_lock:
+            if self.environments.get(environment.id) is environment:
+                self.status_counts[environment.status] -= 1
+                self.status_counts[status] += 1
+            environment.status = status
+    
+    def iter_environments(self, status: Optional[str] = None) -> Iterator[dict]:
+        """Yield a summary of each environment, optionally only those in one status"""
         
-        return [
-            {
+        # Snapshot the items so concurrent creations don't break iteration
+        for env_id, env in list(self.environments.items()):
+            if status is not None and env.status != status:
+                continue
+            yield {
                 'id': env_id,
                 'name': env.name,
                 'description': env.description,
@@ -853,8 +889,21 @@ volumes:
                 'packages_count': len(env.packages),
                 'resource_limits': env.resource_limits
             }
-            for env_id, env in self.environments.items()
-        ]
+    
+    def list_environments(self, status: Optional[str] = None) -> List[dict]:
+        """List all environments, optionally only those in one status"""
+        
+        return list(self.iter_environments(status))
+    
+    def count_environments(self) -> int:
+        """Number of registered environments"""
+        
+        return len(self.environments)
+    
+    def count_active(self) -> int:
+        """Number of environments currently active"""
+        
+        return self.status_counts['active']
     
     def get_environment_details(self, environment_id: str) -> dict:
         """Get detailed information about an environment"""
@@ -950,16 +999,16 @@ volumes:
             
             # Stop and remove old container
             try:
-                container = self.docker_client.containers.get(environment.id)
-                container.stop()
-                container.remove()
+                container = await asyncio.to_thread(self.docker_client.containers.get, environment.id)
+                await asyncio.to_thread(container.stop)
+                await asyncio.to_thread(container.remove)
             except docker.errors.NotFound:
                 pass
             
             # Remove old image
             try:
-                old_image = self.docker_client.images.get(f"nixos-env-{environment.id}")
-                self.docker_client.images.remove(old_image.id, force=True)
+                old_image = await asyncio.to_thread(self.docker_client.images.get, f"nixos-env-{environment.id}")
+                await asyncio.to_thread(self.docker_client.images.remove, old_image.id, force=True)
             except docker.errors.ImageNotFound:
                 pass
             
@@ -996,8 +1045,9 @@ volumes:
             if self.docker_client:
                 # Execute in Docker container
                 try:
-                    container = self.docker_client.containers.get(environment_id)
-                    result = container.exec_run(
+                    container = await asyncio.to_thread(self.docker_client.containers.get, environment_id)
+                    result = await asyncio.to_thread(
+                        container.exec_run,
                         cmd=command,
                         workdir=working_directory,
                         environment=environment.environment_variables
@@ -1021,7 +1071,8 @@ volumes:
                 env_path = os.path.join(self.environments_base_path, environment_id)
                 full_command = f'nix-shell {env_path}/shell.nix --run "{command}"'
                 
-                result = subprocess.run(
+                result = await asyncio.to_thread(
+                    subprocess.run,
                     full_command,
                     shell=True,
                     capture_output=True,
@@ -0,0 +1,138 @@
+"""
+Shared helpers for Podplay Sanctuary's Flask blueprints
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from functools import wraps
+from typing import Any, Coroutine, Dict, Optional, Tuple
+
+import orjson
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+try:
+    # libuv-backed loop for the shared loop only; uvloop supports Linux and macOS
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# One event loop for every blueprint's coroutines, running in a background
+# thread; it is started on first use so importing a blueprint has no side effects
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_loop_lock = threading.Lock()
+
+def get_async_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it if needed"""
+    global _async_loop
+    if _async_loop is None:
+        with _async_loop_lock:
+            if _async_loop is None:
+                loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='sanctuary-async-loop', daemon=True).start()
+                _async_loop = loop
+    return _async_loop
+
+def submit_async(coro: Coroutine) -> Future:
+    """Schedule a coroutine on the shared event loop without waiting"""
+    return asyncio.run_coroutine_threadsafe(coro, get_async_loop())
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared event loop and wait for its result"""
+    future = submit_async(coro)
+    try:
+        return future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        # Cancel the coroutine so it stops occupying the loop
+        future.cancel()
+        raise
+
+def parse_json() -> Optional[dict]:
+    """Parse a JSON object body straight from the raw bytes with orjson"""
+    if not request.is_json:
+        return None
+    try:
+        data = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+# JSON types accepted for request fields, as (python types, description, item types);
+# item types, when set, are checked against every entry of a list
+STRING = ((str,), 'a string', None)
+NUMBER = ((int, float), 'a number', None)
+LIST = ((list,), 'a list', None)
+STRING_LIST = ((list,), 'a list of strings', (str,))
+OBJECT = ((dict,), 'an object', None)
+
+def json_body(*required_fields: str, allow_empty: bool = False, schema: Optional[Dict[str, tuple]] = None):
+    """Decorator that parses and validates the JSON body once and passes it to the route as `data`"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            data = parse_json() or {}
+            
+            missing = [field for field in required_fields if field not in data]
+            if missing:
+                return jsonify({
+                    'success': False,
+                    'error': f"{', '.join(missing)} required"
+                }), 400
+            
+            if not data and not allow_empty:
+                return jsonify({
+                    'success': False,
+                    'error': 'No data provided'
+                }), 400
+            
+            for field, (types, description, item_types) in (schema or {}).items():
+                value = data.get(field)
+                if value is None:
+                    continue
+                if not isinstance(value, types) or (
+                    item_types and not all(isinstance(item, item_types) for item in value)
+                ):
+                    return jsonify({
+                        'success': False,
+                        'error': f'{field} must be {description}'
+                    }), 400
+            
+            return fn(data, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def with_etag(body: bytes) -> Tuple[bytes, str]:
+    """Pair a serialized response body with its ETag"""
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def conditional_json(body: bytes, etag: str, max_age: Optional[int] = None):
+    """
+    Build a JSON response, answering 304 when the client's ETag still matches
+    
+    With max_age, clients and proxies may also reuse the response for that
+    many seconds without asking again.
+    """
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    if max_age is not None:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+def register_error_handler(bp: Blueprint):
+    """Return unexpected failures in a blueprint's routes in the JSON error shape"""
+    logger = logging.getLogger(bp.import_name)
+    
+    @bp.errorhandler(Exception)
+    def handle_route_error(e):
+        # HTTP errors keep their status and any code-specific handler
+        if isinstance(e, HTTPException):
+            return e
+        logger.error("❌ %s failed: %s", request.endpoint, e, exc_info=e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
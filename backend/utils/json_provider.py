@@ -0,0 +1,48 @@
+"""
+JSON provider utilities for Podplay Sanctuary
+"""
+
+from typing import Any, Union
+
+import orjson
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize obj to a JSON string
+        
+        Honours the sort_keys and indent options Flask passes through;
+        datetimes still go through Flask's default hook so the wire
+        format matches DefaultJSONProvider.
+        """
+        return self._dump_bytes(obj, **kwargs).decode('utf-8')
+    
+    def _dump_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        """Serialize obj straight to the UTF-8 bytes orjson produces"""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """
+        Build the jsonify() response from orjson's bytes
+        
+        Same body as DefaultJSONProvider.response, minus the round trip
+        through str and back to bytes for every response.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        
+        return self._app.response_class(self._dump_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype)
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize JSON data from a string or bytes"""
+        return orjson.loads(s)
@@ -29,6 +29,9 @@ interface MemoryContext {
   timestamp: string;
 }
 
+// Type tag on binary WebSocket frames from the backend
+const AUDIO_FRAME_TAG = 0x01;
+
 const GeminiLiveStudio: React.FC = () => {
   // Connection & Session State
   const [isConnected, setIsConnected] = useState(false);
@@ -157,6 +160,7 @@ const GeminiLiveStudio: React.FC = () => {
       const wsUrl = `${protocol}//${window.location.host}/api/gemini-live/stream?session_id=${sessionId}`;
       
       websocketRef.current = new WebSocket(wsUrl);
+      websocketRef.current.binaryType = 'arraybuffer';
       
       websocketRef.current.onopen = () => {
         setIsConnected(true);
@@ -165,6 +169,14 @@ const GeminiLiveStudio: React.FC = () => {
       };
       
       websocketRef.current.onmessage = (event) => {
+        // Binary frames carry audio: a 1-byte type tag followed by 16-bit PCM
+        if (event.data instanceof ArrayBuffer) {
+          if (new Uint8Array(event.data, 0, 1)[0] === AUDIO_FRAME_TAG) {
+            playAudioResponse(new Int16Array(event.data.slice(1)));
+          }
+          return;
+        }
+        
         const data = JSON.parse(event.data);
         handleGeminiMessage(data);
       };
@@ -190,7 +202,7 @@ const GeminiLiveStudio: React.FC = () => {
   const handleGeminiMessage = (data: any) => {
     switch (data.type) {
       case 'audio_response':
-        playAudioResponse(data.audio_data);
+        playAudioResponse(decodePcm16(data.audio_data));
         break;
         
       case 'text_response':
@@ -260,11 +272,8 @@ const GeminiLiveStudio: React.FC = () => {
             audioBuffer[i] = audioData[i] * 32767;
           }
           
-          websocketRef.current.send(JSON.stringify({
-            type: 'audio_input',
-            data: Array.from(audioBuffer),
-            timestamp: Date.now()
-          }));
+          // Raw PCM goes out as a binary frame, no JSON wrapping
+          websocketRef.current.send(audioBuffer.buffer);
         }
       };
       
@@ -368,8 +377,14 @@ const GeminiLiveStudio: React.FC = () => {
     }
   };
 
+  // Decode base64-encoded 16-bit PCM from the backend into samples
+  const decodePcm16 = (audioBase64: string): Int16Array => {
+    const bytes = Uint8Array.from(atob(audioBase64), c => c.charCodeAt(0));
+    return new Int16Array(bytes.buffer, 0, bytes.byteLength >> 1);
+  };
+
   // Play audio response from Gemini
-  const playAudioResponse = (audioData: number[]) => {
+  const playAudioResponse = (audioData: ArrayLike<number>) => {
     try {
       const audioContext = new AudioContext();
       const audioBuffer = audioContext.createBuffer(1, audioData.length, 24000);